@@ -0,0 +1,111 @@
+import random
+import time
+from typing import List
+
+if __package__:
+    from .cnf_variant13 import _parse, to_cnf
+    from .cyk import CYK
+    from .earley import Earley
+else:  # run as a script from this folder
+    from cnf_variant13 import _parse, to_cnf
+    from cyk import CYK
+    from earley import Earley
+
+# ───────────── Workload: long nullable right‑hand sides ─────────────
+def nullable_chain(k: int) -> List[str]:
+    """S → N0 N1 … N(k-1) with k nullable symbols, each of them → a | ε."""
+    names = [f"N{i}" for i in range(k)]
+    lines = ["S -> " + " ".join(names)]
+    lines += [f"{X}->a|ε" for X in names]
+    return lines
+
+# ───────────── Workload: many long right‑hand sides ─────────────
+def long_rhs(n: int, length: int, seed=0) -> List[str]:
+    """n productions over 8 nonterminals and 2 terminals, RHS length 3..length."""
+    rnd = random.Random(seed)
+    names = "SABCDEFG"
+    lines = [f"{X}->a|b" for X in names]
+    for _ in range(n):
+        rhs = "".join(rnd.choice(names + "ab") for _ in range(rnd.randint(3, length)))
+        lines.append(f"{rnd.choice(names)}->{rhs}")
+    return lines
+
+def run(lines: List[str], bin_first=False, share_suffixes=True):
+    t = time.perf_counter()
+    g = to_cnf(lines, bin_first=bin_first, share_suffixes=share_suffixes)
+    elapsed = time.perf_counter() - t
+    return elapsed, sum(len(prods) for prods in g.values())
+
+def helpers(lines: List[str], share_suffixes: bool) -> int:
+    g = to_cnf(lines, share_suffixes=share_suffixes)
+    return sum(1 for A in g if A[0] == "X" and A[1:].isdigit())
+
+# ───────────── Workload: Earley vs CYK on the same grammar ─────────────
+ARITHMETIC = ["E -> E + T | T", "T -> T * F | F", "F -> ( E ) | a"]
+AMBIGUOUS = ["S->SS|a"]
+RIGHT_RECURSIVE = ["S->aS|b"]
+
+def expression(n: int, seed=0) -> List[str]:
+    """A random ARITHMETIC sentence of about n tokens."""
+    rnd = random.Random(seed)
+    out = ["a"]
+    while len(out) < n:
+        if rnd.random() < 0.2:
+            out = ["("] + out + [")"]
+        else:
+            out += [rnd.choice("+*"), "a"]
+    return out
+
+def earley_vs_cyk(lines: List[str], word, start="S"):
+    """
+    Seconds for CNF conversion + CYK recognition, Earley recognition (with
+    Leo items) and Earley parsing into a forest, all on `word`.
+    """
+    t = time.perf_counter()
+    cyk = CYK(to_cnf(lines, start=start), start=start)
+    t_cnf = time.perf_counter() - t
+    t = time.perf_counter()
+    ok_cyk = cyk.recognize(word)
+    t_cyk = time.perf_counter() - t
+
+    earley = Earley(_parse(lines), start=start)
+    t = time.perf_counter()
+    ok_earley = earley.recognize(word)
+    t_rec = time.perf_counter() - t
+    t = time.perf_counter()
+    forest = earley.parse(word)
+    t_parse = time.perf_counter() - t
+    assert ok_cyk == ok_earley == (forest is not None)
+    return t_cnf, t_cyk, t_rec, t_parse, forest.count() if forest else 0
+
+# ──────────────────────── Main ────────────────────────
+if __name__ == "__main__":
+    # the classic DEL‑first order grows as 2^k, so stop it early
+    classic_limit = 16
+    print(f"{'k':>3} | {'DEL-first s':>12} {'prods':>7} | {'BIN-first s':>12} {'prods':>7}")
+    for k in (4, 8, 12, 16, 20, 24):
+        lines = nullable_chain(k)
+        if k <= classic_limit:
+            t_old, n_old = run(lines, bin_first=False)
+            old = f"{t_old:12.4f} {n_old:7d}"
+        else:
+            old = f"{'skipped':>12} {'':>7}"
+        t_new, n_new = run(lines, bin_first=True)
+        print(f"{k:3d} | {old} | {t_new:12.4f} {n_new:7d}")
+
+    print(f"\n{'prods':>6} {'len':>4} | {'X helpers, fresh':>16} {'shared':>7}")
+    for n, length in ((1000, 6), (10000, 6), (10000, 10), (50000, 8)):
+        lines = long_rhs(n, length)
+        print(f"{n:6d} {length:4d} | {helpers(lines, False):16d} {helpers(lines, True):7d}")
+
+    print(f"\n{'grammar':>15} {'n':>5} | {'to_cnf s':>9} {'CYK s':>9} | "
+          f"{'Earley s':>9} {'forest s':>9} {'trees':>10}")
+    cases = [("arithmetic", ARITHMETIC, "E", expression, (25, 50, 100, 200))]
+    cases += [("ambiguous", AMBIGUOUS, "S", lambda n: "a" * n, (25, 50, 100))]
+    cases += [("right-rec", RIGHT_RECURSIVE, "S", lambda n: "a" * (n - 1) + "b", (100, 200, 400))]
+    for label, grammar, start, make, sizes in cases:
+        for n in sizes:
+            t_cnf, t_cyk, t_rec, t_parse, trees = earley_vs_cyk(grammar, make(n), start)
+            trees = f"{trees:.3g}" if trees > 1e9 else str(trees)
+            print(f"{label:>15} {n:5d} | {t_cnf:9.4f} {t_cyk:9.4f} | "
+                  f"{t_rec:9.4f} {t_parse:9.4f} {trees:>10}")
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import marshal
+import os
+import tempfile
+import zlib
+from collections import OrderedDict
+from typing import Optional
+
+if __package__:
+    from .cnf_variant13 import Grammar, _parse
+else:  # run as a script from this folder
+    from cnf_variant13 import Grammar, _parse
+
+# bump when the pipeline output changes so stale entries are never served
+CACHE_VERSION = 2
+
+# ─────────────────────── Persistent CNF cache ───────────────────────
+class CNFCache:
+    """
+    Content‑addressed cache for `to_cnf` results.
+
+    Entries are keyed by a SHA‑256 of the canonical parsed grammar, the start
+    symbol and the pipeline options, and stored as zlib‑compressed `marshal`
+    blobs (one file per key). The directory is trimmed to `max_bytes` by
+    evicting the least recently used files (mtime is refreshed on every hit).
+    An in‑process LRU of `memo_size` entries sits in front of the disk, so a
+    repeated lookup is a dict access. Every hit returns a fresh copy, so a
+    caller editing its grammar cannot corrupt later hits. Only files named
+    like entries (`<sha256>.m<marshal version>`) are ever evicted or cleared,
+    so the directory may be shared.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes=64 << 20, memo_size=128):
+        self.directory = directory or os.path.join(
+            os.path.expanduser("~"), ".cache", "lfa_cnf"
+        )
+        self.max_bytes = max_bytes
+        self.memo_size = memo_size
+        self._memo: "OrderedDict[str, Grammar]" = OrderedDict()
+        self._keys: "OrderedDict[tuple, str]" = OrderedDict()
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(parsed: Grammar, start: str, **options) -> str:
+        canonical = json.dumps(
+            [
+                CACHE_VERSION,
+                start,
+                sorted(options.items()),
+                sorted((A, sorted(prods)) for A, prods in parsed.items()),
+            ],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def key_for(self, lines, start: str, **options) -> str:
+        """`key` of the parsed `lines`, memoized on the raw text to skip parsing."""
+        raw = (tuple(lines), start, tuple(sorted(options.items())))
+        key = self._keys.get(raw)
+        if key is None:
+            key = self._keys[raw] = self.key(_parse(lines), start, **options)
+            while len(self._keys) > self.memo_size:
+                self._keys.popitem(last=False)
+        else:
+            self._keys.move_to_end(raw)
+        return key
+
+    def _path(self, key: str) -> str:
+        # marshal's format depends on the interpreter, so it is part of the name
+        return os.path.join(self.directory, f"{key}.m{marshal.version}")
+
+    def _is_entry(self, name: str) -> bool:
+        key, dot, suffix = name.partition(".")
+        return (bool(dot) and suffix == f"m{marshal.version}" and len(key) == 64
+                and all(c in "0123456789abcdef" for c in key))
+
+    @staticmethod
+    def _copy(g: Grammar) -> Grammar:
+        # productions are tuples, so copying the sets is enough
+        return {A: set(prods) for A, prods in g.items()}
+
+    def _remember(self, key: str, g: Grammar):
+        self._memo[key] = g
+        self._memo.move_to_end(key)
+        while len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Grammar]:
+        g = self._memo.get(key)
+        if g is not None:
+            self._memo.move_to_end(key)
+            return self._copy(g)
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                g = marshal.loads(zlib.decompress(f.read()))
+            os.utime(path)
+        except (OSError, ValueError, EOFError, TypeError, zlib.error):
+            return None
+        self._remember(key, g)
+        return self._copy(g)
+
+    def put(self, key: str, g: Grammar):
+        self._remember(key, self._copy(g))
+        blob = zlib.compress(marshal.dumps(g))
+        # write to a temp file first so readers never see a partial entry
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(blob)
+        os.replace(tmp, self._path(key))
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not self._is_entry(name):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        self._memo.clear()
+        self._keys.clear()
+        for name in os.listdir(self.directory):
+            if not self._is_entry(name):
+                continue
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
@@ -1,34 +1,126 @@
-from typing import Dict, Set, Tuple, List
+import json
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 EPS = "ε"  # Marker for epsilon
 
+Grammar = Dict[str, Set[Tuple[str, ...]]]  # named form: parse input / public output
+Rules = Dict[int, Set[Tuple[int, ...]]]    # interned form the passes run on
+
 # ────────────────────────── Parsing ──────────────────────────
-def _parse(lines: List[str]) -> Dict[str, Set[Tuple[str, ...]]]:
-    g: Dict[str, Set[Tuple[str, ...]]] = {}
-    for l in lines:
-        L, R = l.split("->")
-        L = L.strip()
-        for alt in R.split("|"):
-            alt = alt.strip()
+def _parse(lines: List[str]) -> Grammar:
+    """
+    Parse `A -> α | β` lines. If any right‑hand side contains whitespace, all
+    of them are split on whitespace, so symbols may be longer than one
+    character (`Expr -> Term plus Expr`); otherwise every character is a
+    symbol (`S -> aB`).
+    """
+    rules = [(L.strip(), [alt.strip() for alt in R.split("|")])
+             for L, R in (l.split("->") for l in lines)]
+    spaced = any(c.isspace() for _, alts in rules for alt in alts for c in alt)
+
+    g: Grammar = {}
+    for L, alts in rules:
+        for alt in alts:
             # an empty tuple represents ε
-            g.setdefault(L, set()).add(
-                tuple(alt) if alt and alt != EPS else tuple()
-            )
+            if not alt or alt == EPS:
+                rhs: Tuple[str, ...] = tuple()
+            else:
+                rhs = tuple(alt.split()) if spaced else tuple(alt)
+            g.setdefault(L, set()).add(rhs)
     return g
 
-# ───────────────── ε‑elimination ─────────────────
-def _rm_eps(g: Dict[str, Set[Tuple[str, ...]]], start="S"):
-    # 1) find nullable nonterminals
-    nullable, changed = set(), True
-    while changed:
-        changed = False
+# ───────────────────────── Symbol table ─────────────────────────
+class SymbolTable:
+    """
+    Interns every grammar symbol once into a dense int id. `nt[i]` is 1 when
+    symbol i is a nonterminal, so passes never inspect symbol names.
+    """
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        self.nt = bytearray()
+        self._next: Dict[str, int] = {}
+
+    def intern(self, name: str, nonterminal=False) -> int:
+        i = self.ids.get(name)
+        if i is None:
+            i = self.ids[name] = len(self.names)
+            self.names.append(name)
+            self.nt.append(1 if nonterminal else 0)
+        elif nonterminal:
+            self.nt[i] = 1
+        return i
+
+    def fresh(self, prefix: str) -> int:
+        """New nonterminal `prefix1`, `prefix2`, … skipping names already taken."""
+        n = self._next.get(prefix, 1)
+        while f"{prefix}{n}" in self.ids:
+            n += 1
+        self._next[prefix] = n + 1
+        return self.intern(f"{prefix}{n}", nonterminal=True)
+
+    @classmethod
+    def from_grammar(cls, g: Grammar):
+        """
+        Intern a parsed grammar. Nonterminals are the left‑hand sides plus any
+        symbol starting with an uppercase letter (undefined, hence useless).
+        """
+        sym = cls()
+        for A in g:
+            sym.intern(A, nonterminal=True)
+        rules: Rules = {}
         for A, prods in g.items():
-            if A not in nullable and any(
-                (not p) or all(s in nullable for s in p)
-                for p in prods
-            ):
-                nullable.add(A)
-                changed = True
+            rules[sym.ids[A]] = {
+                tuple(sym.intern(s, s[0].isupper()) for s in p) for p in prods
+            }
+        return sym, rules
+
+    def export(self, g: Rules) -> Grammar:
+        name = self.names.__getitem__
+        return {
+            name(A): {tuple(map(name, p)) for p in prods}
+            for A, prods in g.items()
+        }
+
+# ───────────────── Worklist fixpoint ─────────────────
+def _derivable(g: Rules, counted) -> Set[int]:
+    """
+    Least set of nonterminals A with a production whose symbols s satisfying
+    counted(s) are all already in the set. Each production keeps a counter of
+    unsatisfied occurrences and each symbol indexes the productions using it,
+    so every occurrence is decremented once: linear in the grammar size.
+    """
+    heads: List[int] = []
+    missing: List[int] = []
+    users: Dict[int, List[int]] = {}
+    done: Set[int] = set()
+    queue: List[int] = []
+
+    for A, prods in g.items():
+        for p in prods:
+            need = [s for s in p if counted(s)]
+            for s in need:
+                users.setdefault(s, []).append(len(heads))
+            heads.append(A)
+            missing.append(len(need))
+            if not need and A not in done:
+                done.add(A)
+                queue.append(A)
+
+    while queue:
+        for i in users.get(queue.pop(), ()):
+            missing[i] -= 1
+            if missing[i] == 0 and heads[i] not in done:
+                done.add(heads[i])
+                queue.append(heads[i])
+    return done
+
+# ───────────────── ε‑elimination ─────────────────
+def _rm_eps(g: Rules, start: int):
+    # 1) find nullable nonterminals (a symbol counts only once it is nullable)
+    nullable = _derivable(g, lambda s: True)
 
     # 2) rebuild grammar without epsilons
     ng = {A: set() for A in g}
@@ -48,60 +140,113 @@ def _rm_eps(g: Dict[str, Set[Tuple[str, ...]]], start="S"):
     return ng
 
 # ───────────── Unit‑production removal ─────────────
-def _rm_unit(g: Dict[str, Set[Tuple[str, ...]]]):
-    ng = {A: set() for A in g}
-    for A in g:
-        stack, seen = [A], set()
-        while stack:
-            X = stack.pop()
-            for p in g[X]:
-                # if p is a single nonterminal → unit production
-                if len(p) == 1 and p[0].isupper():
-                    B = p[0]
-                    if B not in seen:
-                        seen.add(B)
-                        stack.append(B)
-                else:
-                    ng[A].add(p)
-    return ng
+def _sccs(nodes: List[int], edges: Dict[int, List[int]]) -> List[List[int]]:
+    """
+    Iterative Tarjan SCC. Components come out in reverse topological order:
+    every component is emitted after all components reachable from it.
+    """
+    index: Dict[int, int] = {}
+    low: Dict[int, int] = {}
+    on_stack: Set[int] = set()
+    stack: List[int] = []
+    out: List[List[int]] = []
+
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(edges.get(root, ())))]
+        while work:
+            v, it = work[-1]
+            for w in it:
+                if w not in index:
+                    index[w] = low[w] = len(index)
+                    stack.append(w)
+                    on_stack.add(w)
+                    work.append((w, iter(edges.get(w, ()))))
+                    break
+                if w in on_stack:
+                    low[v] = min(low[v], index[w])
+            else:
+                work.pop()
+                if work:
+                    u = work[-1][0]
+                    low[u] = min(low[u], low[v])
+                if low[v] == index[v]:
+                    comp = []
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        comp.append(w)
+                        if w == v:
+                            break
+                    out.append(comp)
+    return out
+
+def _rm_unit(g: Rules, nt: bytearray):
+    # split every nonterminal into unit edges A → B and its other productions
+    units: Dict[int, List[int]] = {}
+    own: Dict[int, Set[Tuple[int, ...]]] = {}
+    for A, prods in g.items():
+        units[A], own[A] = [], set()
+        for p in prods:
+            # if p is a single nonterminal → unit production
+            if len(p) == 1 and nt[p[0]]:
+                if p[0] in g:
+                    units[A].append(p[0])
+            else:
+                own[A].add(p)
+
+    # condense unit cycles; successors are closed before their predecessors,
+    # so each component's closure is built once from its successors' closures
+    comp_of: Dict[int, int] = {}
+    closure: List[Set[Tuple[int, ...]]] = []
+    for c, comp in enumerate(_sccs(list(g), units)):
+        prods: Set[Tuple[int, ...]] = set()
+        for A in comp:
+            comp_of[A] = c
+            prods |= own[A]
+        for A in comp:
+            for B in units[A]:
+                if comp_of[B] != c:
+                    prods |= closure[comp_of[B]]
+        closure.append(prods)
+
+    # ε survives only where it was declared (the start symbol after DEL);
+    # a nonterminal reaching it through units was already made ε‑free by DEL
+    return {
+        A: set(closure[comp_of[A]]) if () in g[A] else closure[comp_of[A]] - {()}
+        for A in g
+    }
 
 # ─────── Useless‑symbol removal ───────
-def _rm_useless(g: Dict[str, Set[Tuple[str, ...]]], start="S"):
-    # (a) remove non‑productive symbols
-    prod, changed = set(), True
-    while changed:
-        changed = False
-        for A, prods in g.items():
-            if A not in prod and any(
-                all((not s.isupper()) or s in prod for s in p)
-                for p in prods
-            ):
-                prod.add(A)
-                changed = True
+def _rm_useless(g: Rules, nt: bytearray, start: int):
+    # (a) remove non‑productive symbols (terminals are always productive)
+    prod = _derivable(g, nt.__getitem__)
 
     g = {
-        A: {p for p in prods if all((not s.isupper()) or s in prod for s in p)}
+        A: {p for p in prods if all((not nt[s]) or s in prod for s in p)}
         for A, prods in g.items() if A in prod
     }
 
-    # (b) remove unreachable symbols
-    acc, changed = {start}, True
-    while changed:
-        changed = False
-        for A in list(acc):
-            for p in g.get(A, []):
-                for s in p:
-                    if s.isupper() and s in g and s not in acc:
-                        acc.add(s)
-                        changed = True
+    # (b) remove unreachable symbols, visiting each nonterminal once
+    acc, stack = {start}, [start]
+    while stack:
+        for p in g.get(stack.pop(), ()):
+            for s in p:
+                if nt[s] and s in g and s not in acc:
+                    acc.add(s)
+                    stack.append(s)
 
     return {A: g[A] for A in acc}
 
 # ───────── Terminals → Variables ─────────
-def _term_to_var(g: Dict[str, Set[Tuple[str, ...]]]):
-    mp: Dict[str, str] = {}
-    extra: Dict[str, Set[Tuple[str, ...]]] = {}
-    cnt = 1
+def _term_to_var(g: Rules, sym: SymbolTable):
+    mp: Dict[int, int] = {}
+    extra: Rules = {}
+    nt = sym.nt
 
     for A, prods in list(g.items()):
         newset = set()
@@ -109,12 +254,11 @@ def _term_to_var(g: Dict[str, Set[Tuple[str, ...]]]):
             if len(p) >= 2:
                 rep = []
                 for s in p:
-                    if s.isupper():
+                    if nt[s]:
                         rep.append(s)
                     else:
                         if s not in mp:
-                            v = f"T{cnt}"
-                            cnt += 1
+                            v = sym.fresh("T")
                             mp[s] = v
                             extra[v] = {(s,)}
                         rep.append(mp[s])
@@ -128,69 +272,185 @@ def _term_to_var(g: Dict[str, Set[Tuple[str, ...]]]):
     return g
 
 # ───────────── Binarize long RHS ─────────────
-def break_long(
-    g: Dict[str, Set[Tuple[str, ...]]], prefix="X"
-) -> Dict[str, Set[Tuple[str, ...]]]:
-    newg: Dict[str, Set[Tuple[str, ...]]] = {A: set() for A in g}
-    fresh_id = 1
-
-    def fresh() -> str:
-        nonlocal fresh_id
-        v = f"{prefix}{fresh_id}"
-        fresh_id += 1
+def break_long(g: Rules, sym: SymbolTable, prefix="X", share=True) -> Rules:
+    """
+    Split every RHS longer than 2 into a right‑leaning chain of helpers.
+    With `share`, helpers are keyed by the suffix they derive, so `A → bDAB`
+    and `C → aDAB` reuse the same chain for `DAB`.
+    """
+    newg: Rules = {A: set() for A in g}
+    chains: Dict[Tuple[int, ...], int] = {}
+
+    def fresh() -> int:
+        v = sym.fresh(prefix)
         newg.setdefault(v, set())
         return v
 
     for A, prods in g.items():
         for rhs in prods:
-            # keep length 0,1,2 as is
-            if len(rhs) <= 2:
-                newg[A].add(rhs)
-            else:
-                # split A → X1 X2 … Xk into binary chain
-                first, *rest = rhs
+            # split A → X1 X2 … Xk into binary chain (length 0,1,2 kept as is)
+            head, rest = A, rhs
+            while len(rest) > 2:
+                tail = rest[1:]
+                aux = chains.get(tail) if share else None
+                if aux is not None:
+                    newg[head].add((rest[0], aux))
+                    break
                 aux = fresh()
-                newg[A].add((first, aux))
+                if share:
+                    chains[tail] = aux
+                newg[head].add((rest[0], aux))
+                head, rest = aux, tail
+            else:
+                newg[head].add(rest)
+    return newg
 
-                prev = aux
-                while len(rest) > 2:
-                    sym, *rest = rest
-                    nxt = fresh()
-                    newg[prev].add((sym, nxt))
-                    prev = nxt
+# ─────────────────── Fresh start symbol ────────────────────
+def _new_start(g: Rules, sym: SymbolTable, start: int) -> int:
+    """
+    Pick the start symbol for START: `start` itself unless it occurs on a RHS.
+    Then a fresh symbol is added and the two swap names, so the result still
+    starts at the caller's start name and the old start becomes `S0`, ….
+    """
+    if not any(start in p for prods in g.values() for p in prods):
+        return start
+    name = sym.names[start] + "0"
+    while name in sym.ids:
+        name += "0"
+    new = sym.intern(name, nonterminal=True)
+    names, ids = sym.names, sym.ids
+    names[start], names[new] = names[new], names[start]
+    ids[names[start]], ids[names[new]] = start, new
+    return new
 
-                newg[prev].add(tuple(rest))
-    return newg
+def _add_start(g: Rules, start: int, new: int):
+    if new != start:
+        g = dict(g)
+        g[new] = {(start,)}
+    return g
+
+# ─────────────────── Stage instrumentation ────────────────────
+class StageReport:
+    """
+    Stage hook for `to_cnf` that keeps every event and can dump them as JSON.
+    Each event has: stage, title, seconds, productions, nonterminals and
+    peak_productions (largest production count seen so far in the run).
+    """
+
+    def __init__(self):
+        self.stages: List[dict] = []
+
+    def __call__(self, event: dict):
+        self.stages.append(event)
+
+    def to_json(self, indent=2) -> str:
+        return json.dumps(
+            {
+                "stages": self.stages,
+                "total_seconds": sum(e["seconds"] for e in self.stages),
+                "peak_productions": max((e["peak_productions"] for e in self.stages), default=0),
+            },
+            ensure_ascii=False,
+            indent=indent,
+        )
 
 # ─────────────────── Public CNF converter ────────────────────
-def to_cnf(lines: List[str], start="S") -> Dict[str, Set[Tuple[str, ...]]]:
-    g = _parse(lines)
-    print("► Initial grammar:")
-    print(pretty(g), "\n")
+def to_cnf(
+    lines: List[str],
+    start="S",
+    bin_first=False,
+    share_suffixes=True,
+    cache=None,
+    hook: Optional[Callable[[dict], None]] = None,
+    verbose=False,
+) -> Grammar:
+    """
+    Convert the grammar in `lines` to CNF.
 
-    g = _rm_eps(g, start)
-    print("► After ε‑elimination:")
-    print(pretty(g), "\n")
+    The default order is DEL, UNIT, USELESS, TERM, BIN. With `bin_first` the
+    textbook order START, TERM, BIN, DEL, UNIT (+ USELESS) is used instead:
+    binarizing before ε‑elimination keeps every RHS at length ≤ 2, so DEL adds
+    at most 3 variants per production instead of 2^k. START introduces a
+    fresh start symbol only when `start` occurs on a right‑hand side; it
+    takes over the name `start` and the old one is renamed (`S0`, …), so
+    either order returns a grammar whose start symbol is `start`.
 
-    g = _rm_unit(g)
-    print("► After unit‑production removal:")
-    print(pretty(g), "\n")
+    `share_suffixes` lets BIN reuse helper chains for equal suffixes.
 
-    g = _rm_useless(g, start)
-    print("► After removing useless symbols:")
-    print(pretty(g), "\n")
+    All passes run on interned int symbols (see SymbolTable); the result is
+    translated back to names.
 
-    g = _term_to_var(g)
-    print("► After replacing terminals in long RHS:")
-    print(pretty(g), "\n")
+    With a `cache` (see cnf_cache.CNFCache) a grammar seen before, with the
+    same start symbol and options, is returned straight from the cache
+    without running any pass.
 
-    g = break_long(g)
-    print("► Final Chomsky Normal Form:")
-    print(pretty(g), "\n")
+    Nothing is printed unless `verbose` is set, in which case the grammar is
+    pretty‑printed after every stage. `hook` (e.g. a StageReport) is called
+    after every stage with its timing and size, see StageReport.
+    """
+    if cache is not None:
+        key = cache.key_for(lines, start, bin_first=bin_first, share_suffixes=share_suffixes)
+        hit = cache.get(key)
+        if hit is not None:
+            return hit
 
-    return g
+    t = time.perf_counter()
+    parsed = _parse(lines)
+    sym, g = SymbolTable.from_grammar(parsed)
+    s0 = sym.intern(start, nonterminal=True)
+    nt = sym.nt
+    sep = " " if any(len(s) > 1 for s in sym.names) else ""
+    peak = 0
+
+    def report(name: str, title: str, seconds: float):
+        nonlocal peak
+        if hook is not None:
+            size = sum(len(prods) for prods in g.values())
+            peak = max(peak, size)
+            hook({
+                "stage": name,
+                "title": title,
+                "seconds": seconds,
+                "productions": size,
+                "nonterminals": len(g),
+                "peak_productions": peak,
+            })
+        if verbose:
+            print(f"► {title}:")
+            print(pretty(sym.export(g), sep), "\n")
+
+    report("PARSE", "Initial grammar", time.perf_counter() - t)
+
+    if bin_first:
+        new_start = _new_start(g, sym, s0)
+        stages = [
+            ("START", "After adding a fresh start symbol", lambda g: _add_start(g, s0, new_start)),
+            ("TERM", "After replacing terminals in long RHS", lambda g: _term_to_var(g, sym)),
+            ("BIN", "After binarizing long RHS", lambda g: break_long(g, sym, share=share_suffixes)),
+            ("DEL", "After ε‑elimination", lambda g: _rm_eps(g, new_start)),
+            ("UNIT", "After unit‑production removal", lambda g: _rm_unit(g, nt)),
+            ("USELESS", "Final Chomsky Normal Form", lambda g: _rm_useless(g, nt, new_start)),
+        ]
+    else:
+        stages = [
+            ("DEL", "After ε‑elimination", lambda g: _rm_eps(g, s0)),
+            ("UNIT", "After unit‑production removal", lambda g: _rm_unit(g, nt)),
+            ("USELESS", "After removing useless symbols", lambda g: _rm_useless(g, nt, s0)),
+            ("TERM", "After replacing terminals in long RHS", lambda g: _term_to_var(g, sym)),
+            ("BIN", "Final Chomsky Normal Form", lambda g: break_long(g, sym, share=share_suffixes)),
+        ]
+
+    for name, title, stage in stages:
+        t = time.perf_counter()
+        g = stage(g)
+        report(name, title, time.perf_counter() - t)
+
+    result = sym.export(g)
+    if cache is not None:
+        cache.put(key, result)
+    return result
 
-def pretty(g: Dict[str, Set[Tuple[str, ...]]]) -> str:
+def pretty(g: Grammar, sep="") -> str:
     lines = []
     for A in sorted(g):
         rhss = []
@@ -198,7 +458,7 @@ def pretty(g: Dict[str, Set[Tuple[str, ...]]]) -> str:
             if not p:
                 rhss.append(EPS)
             else:
-                rhss.append("".join(p))
+                rhss.append(sep.join(p))
         lines.append(f"{A} → {' | '.join(rhss)}")
     return "\n".join(lines)
 
@@ -217,4 +477,4 @@ if __name__ == "__main__":
         "C->BA",
     ]
 
-    cnf13 = to_cnf(variant13, start="S")
+    cnf13 = to_cnf(variant13, start="S", verbose=True)
@@ -0,0 +1,219 @@
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+if __package__:
+    from .cnf_variant13 import Grammar, to_cnf
+else:  # run as a script from this folder
+    from cnf_variant13 import Grammar, to_cnf
+
+Word = Union[str, Sequence[str]]
+# parse tree: (A, terminal) for A → a, (A, left, right) for A → BC
+Tree = Tuple
+
+# ───────────────────────── CYK engine ─────────────────────────
+class CYK:
+    """
+    CYK recognizer/parser for a grammar in CNF, as returned by `to_cnf`.
+
+    Nonterminals are interned into bit positions, so every chart cell is a
+    single int bitmask. Binary rules are indexed by their left child: for a
+    split with left cell L and right cell R only the bits set in L are tried.
+    """
+
+    _MEMO_LIMIT = 1 << 16
+
+    def __init__(self, g: Grammar, start="S"):
+        self.nonterminals: List[str] = sorted(g)
+        self.bit: Dict[str, int] = {A: i for i, A in enumerate(self.nonterminals)}
+        self.start = start
+        self.start_mask = 1 << self.bit[start] if start in self.bit else 0
+        self.accepts_empty = () in g.get(start, ())
+
+        self.term_mask: Dict[str, int] = {}
+        # by_left[B] = [(C, mask of A with A → BC), …]
+        grouped: Dict[Tuple[int, int], int] = {}
+        for A, prods in g.items():
+            a = 1 << self.bit[A]
+            for p in prods:
+                if len(p) == 1 and p[0] not in self.bit:
+                    self.term_mask[p[0]] = self.term_mask.get(p[0], 0) | a
+                elif len(p) == 2 and p[0] in self.bit and p[1] in self.bit:
+                    key = (self.bit[p[0]], self.bit[p[1]])
+                    grouped[key] = grouped.get(key, 0) | a
+                elif p or A != start:
+                    raise ValueError(f"{A} → {' '.join(p) or 'ε'} is not in CNF")
+        self.by_left: List[List[Tuple[int, int]]] = [[] for _ in self.nonterminals]
+        for (b, c), a in grouped.items():
+            self.by_left[b].append((c, a))
+        self.binary = grouped
+        self._memo: Dict[Tuple[int, int], int] = {}
+
+    @staticmethod
+    def _symbols(word: Word) -> Sequence[str]:
+        return list(word) if isinstance(word, str) else word
+
+    def _combine(self, left: int, right: int) -> int:
+        """Mask of every A with A → BC, B in `left`, C in `right` (memoized)."""
+        key = (left, right)
+        out = self._memo.get(key)
+        if out is not None:
+            return out
+        out = 0
+        rest = left
+        while rest:
+            low = rest & -rest
+            for c, a in self.by_left[low.bit_length() - 1]:
+                if right >> c & 1:
+                    out |= a
+            rest ^= low
+        if len(self._memo) >= self._MEMO_LIMIT:
+            self._memo.clear()
+        self._memo[key] = out
+        return out
+
+    def _chart(self, symbols: Sequence[str]) -> Optional[List[List[int]]]:
+        n = len(symbols)
+        # chart[i][k] = mask of nonterminals deriving symbols[i:k]
+        chart = [[0] * (n + 1) for _ in range(n + 1)]
+        for i, s in enumerate(symbols):
+            mask = self.term_mask.get(s, 0)
+            if not mask:
+                return None  # unknown terminal: no cell can ever cover it
+            chart[i][i + 1] = mask
+        for span in range(2, n + 1):
+            for i in range(n - span + 1):
+                k = i + span
+                row = chart[i]
+                cell = 0
+                for m in range(i + 1, k):
+                    left, right = row[m], chart[m][k]
+                    if left and right:
+                        cell |= self._combine(left, right)
+                row[k] = cell
+        return chart
+
+    def recognize(self, word: Word) -> bool:
+        """Membership test only: no back‑pointers are kept."""
+        symbols = self._symbols(word)
+        if not symbols:
+            return self.accepts_empty
+        chart = self._chart(symbols)
+        return bool(chart and chart[0][len(symbols)] & self.start_mask)
+
+    def parse(self, word: Word) -> Optional[Tree]:
+        """
+        Return one parse tree for `word`, or None if it is rejected. Back
+        pointers are recovered from the recognition chart, one split per node.
+        """
+        symbols = self._symbols(word)
+        if not symbols:
+            return (self.start,) if self.accepts_empty else None
+        chart = self._chart(symbols)
+        if not chart or not chart[0][len(symbols)] & self.start_mask:
+            return None
+
+        def split(A: str, i: int, k: int) -> Tuple[Tuple, Tuple]:
+            a = self.bit[A]
+            for m in range(i + 1, k):
+                left, right = chart[i][m], chart[m][k]
+                for (b, c), mask in self.binary.items():
+                    if mask >> a & 1 and left >> b & 1 and right >> c & 1:
+                        return (self.nonterminals[b], i, m), (self.nonterminals[c], m, k)
+            raise AssertionError("inconsistent chart")
+
+        # explicit stack: a tree can be as deep as the word is long
+        root = (self.start, 0, len(symbols))
+        children: Dict[Tuple, Tuple[Tuple, Tuple]] = {}
+        built: Dict[Tuple, Tree] = {}
+        stack = [root]
+        while stack:
+            node = stack[-1]
+            A, i, k = node
+            if k == i + 1:
+                built[node] = (A, symbols[i])
+            elif node not in children:
+                children[node] = split(A, i, k)
+                stack.extend(children[node])
+                continue
+            else:
+                left, right = children[node]
+                built[node] = (A, built[left], built[right])
+            stack.pop()
+        return built[root]
+
+    def recognize_batch(self, words: Sequence[Word]) -> List[bool]:
+        """
+        Vectorised recognition of many words of the same length with NumPy:
+        the chart is a boolean array (word × i × k × nonterminal) and each
+        split is one gather plus one matrix product over all binary rules.
+        """
+        import numpy as np
+
+        batch = [self._symbols(w) for w in words]
+        if not batch:
+            return []
+        n = len(batch[0])
+        if any(len(w) != n for w in batch):
+            raise ValueError("recognize_batch needs words of equal length")
+        if n == 0:
+            return [self.accepts_empty] * len(batch)
+
+        N = len(self.nonterminals)
+        rules = list(self.binary.items())
+        B = np.array([b for (b, _), _ in rules], dtype=np.intp)
+        C = np.array([c for (_, c), _ in rules], dtype=np.intp)
+        # rule → parent one‑hot matrix (a rule key may have several parents)
+        # int32: a uint8 product would wrap to 0 at 256 matching rules per parent
+        to_parent = np.zeros((len(rules), N), dtype=np.int32)
+        for r, (_, mask) in enumerate(rules):
+            for a in range(N):
+                if mask >> a & 1:
+                    to_parent[r, a] = 1
+
+        term_rows = {
+            t: np.array([mask >> a & 1 for a in range(N)], dtype=bool)
+            for t, mask in self.term_mask.items()
+        }
+        empty = np.zeros(N, dtype=bool)
+        chart = np.zeros((len(batch), n, n + 1, N), dtype=bool)
+        for w, symbols in enumerate(batch):
+            for i, s in enumerate(symbols):
+                chart[w, i, i + 1] = term_rows.get(s, empty)
+
+        for span in range(2, n + 1):
+            for i in range(n - span + 1):
+                k = i + span
+                cell = np.zeros((len(batch), N), dtype=bool)
+                for m in range(i + 1, k):
+                    hits = chart[:, i, m, B] & chart[:, m, k, C]
+                    cell |= (hits.astype(np.int32) @ to_parent) > 0
+                chart[:, i, k] = cell
+
+        s = self.bit.get(self.start)
+        if s is None:
+            return [False] * len(batch)
+        return chart[:, 0, n, s].tolist()
+
+def pretty_tree(t: Tree, indent=0) -> str:
+    pad = "  " * indent
+    if len(t) == 1:
+        return f"{pad}{t[0]} → {'ε'}"
+    if len(t) == 2:
+        return f"{pad}{t[0]} → {t[1]}"
+    return "\n".join(
+        [f"{pad}{t[0]}", pretty_tree(t[1], indent + 1), pretty_tree(t[2], indent + 1)]
+    )
+
+# ──────────────────────── Main: Variant 13 ────────────────────────
+if __name__ == "__main__":
+    variant13: List[str] = [
+        "S->aB", "S->DA", "A->a", "A->BD", "A->bDAB",
+        "B->b", "B->BA", "D->ε", "D->BA", "C->BA",
+    ]
+    cnf13 = to_cnf(variant13, start="S")
+
+    cyk = CYK(cnf13, start="S")
+    for w in ["ab", "ba", "bba", "abab", "bbab", "aa", ""]:
+        print(f"'{w}': {'accepted' if cyk.recognize(w) else 'rejected'}")
+
+    print("\nParse tree for 'bab':")
+    print(pretty_tree(cyk.parse("bab")))
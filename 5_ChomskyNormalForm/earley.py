@@ -0,0 +1,369 @@
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+
+if __package__:
+    from .cnf_variant13 import Grammar, _parse
+else:  # run as a script from this folder
+    from cnf_variant13 import Grammar, _parse
+
+Word = Union[str, Sequence[str]]
+Item = Tuple[int, int]  # (dotted rule id, origin)
+# forest node keys: (symbol, i, j) for a symbol spanning word[i:j],
+# (dotted rule id, i, j) for the prefix of a rule up to its dot
+Node = Tuple
+# parse tree: (A, child, …) with terminals as plain strings; (A,) for A → ε
+Tree = Tuple
+
+# ───────────────────────── Earley engine ─────────────────────────
+class Earley:
+    """
+    Earley recognizer/parser working on the grammar as `_parse` returns it:
+    any right-hand side, ε-productions included, no normal form needed.
+
+    Every rule is laid out as consecutive dotted-rule ids, so an item is an
+    (id, origin) pair and moving the dot is `id + 1`. A symbol is a
+    nonterminal when it has rules or starts with an uppercase letter (the
+    same rule as `to_cnf`). Nullable nonterminals are computed once; when
+    one is predicted the dot also skips over it (Aycock & Horspool), so
+    ε-completions never have to be revisited. `recognize` applies Leo's
+    optimization: a deterministic chain of right-recursive completions is
+    collapsed into its topmost item, making right recursion linear.
+    """
+
+    def __init__(self, g: Grammar, start="S"):
+        self.start = start
+        self.nonterminals: Set[str] = set(g) | {
+            s for prods in g.values() for p in prods for s in p if s[:1].isupper()
+        }
+        # dotted rule id → symbol after the dot (None when complete) and lhs;
+        # id 0..1 is the augmented rule ⟨start'⟩ → start
+        self._next: List[Optional[str]] = [start, None]
+        self._lhs: List[Optional[str]] = [None, None]
+        self._first: Dict[str, List[int]] = {}
+        for A in sorted(g):
+            for p in sorted(g[A]):
+                self._first.setdefault(A, []).append(len(self._next))
+                self._next += list(p) + [None]
+                self._lhs += [A] * (len(p) + 1)
+        self.nullable = self._nullable(g)
+
+    @staticmethod
+    def _nullable(g: Grammar) -> Set[str]:
+        """Nonterminals deriving ε (counting fixpoint, linear in |g|)."""
+        waiting: Dict[str, List[List]] = {}
+        queue = []
+        for A, prods in g.items():
+            for p in prods:
+                if not p:
+                    queue.append(A)
+                    continue
+                counter = [A, len(p)]
+                for s in p:
+                    waiting.setdefault(s, []).append(counter)
+        out: Set[str] = set()
+        while queue:
+            A = queue.pop()
+            if A in out:
+                continue
+            out.add(A)
+            for counter in waiting.get(A, ()):
+                counter[1] -= 1
+                if not counter[1]:
+                    queue.append(counter[0])
+        return out
+
+    @staticmethod
+    def _symbols(word: Word) -> Sequence[str]:
+        return list(word) if isinstance(word, str) else word
+
+    def _chart(self, symbols: Sequence[str], leo: bool):
+        """
+        Build the Earley sets for `symbols`. Returns (sets, waiting) where
+        sets[k] is the set of items in Earley set k and waiting[k] maps a
+        nonterminal to the items of set k with the dot before it, or None
+        as soon as a set comes out empty.
+        """
+        nxt, lhs, first = self._next, self._lhs, self._first
+        nonterminals, nullable = self.nonterminals, self.nullable
+        n = len(symbols)
+        sets: List[Set[Item]] = []
+        waiting: List[Dict[str, List[Item]]] = []
+        # leo_memo[j][A]: topmost item of the deterministic chain above A in set j
+        leo_memo: List[Dict[str, Optional[Item]]] = []
+
+        def leo_top(j: int, A: str) -> Optional[Item]:
+            # walk down the chain in a loop (it is as long as the right
+            # recursion), then memoize every level on the way back
+            path: List[Tuple[Dict[str, Optional[Item]], str, Optional[Item]]] = []
+            top = None
+            while True:
+                memo = leo_memo[j]
+                if A in memo:
+                    top = memo[A]
+                    break
+                memo[A] = None  # guards against unit cycles
+                w = waiting[j].get(A, ())
+                if len(w) != 1 or nxt[w[0][0] + 1] is not None:
+                    path.append((memo, A, None))
+                    break
+                dr, origin = w[0]
+                path.append((memo, A, (dr + 1, origin)))
+                j, A = origin, lhs[dr]
+            for memo, A, item in reversed(path):
+                if item is not None:
+                    top = top or item
+                memo[A] = top
+            return top
+
+        items: List[Item] = [(0, 0)]
+        for k in range(n + 1):
+            seen = set(items)
+            wait: Dict[str, List[Item]] = {}
+            sets.append(seen)
+            waiting.append(wait)
+            leo_memo.append({})
+            scanned: List[Item] = []
+            token = symbols[k] if k < n else None
+
+            def add(item: Item):
+                if item not in seen:
+                    seen.add(item)
+                    items.append(item)
+
+            i = 0
+            while i < len(items):
+                dr, origin = items[i]
+                i += 1
+                X = nxt[dr]
+                if X is None:
+                    # origin == k means A ⇒* ε: already handled at prediction
+                    if origin < k:
+                        A = lhs[dr]
+                        top = leo_top(origin, A) if leo else None
+                        if top is not None:
+                            add(top)
+                        else:
+                            for pdr, porigin in waiting[origin].get(A, ()):
+                                add((pdr + 1, porigin))
+                elif X in nonterminals:
+                    if X not in wait:
+                        wait[X] = []
+                        for r in first.get(X, ()):
+                            add((r, k))
+                    wait[X].append((dr, origin))
+                    if X in nullable:
+                        add((dr + 1, origin))
+                elif X == token:
+                    scanned.append((dr + 1, origin))
+
+            if k < n and not scanned:
+                return None
+            items = scanned
+        return sets, waiting
+
+    def recognize(self, word: Word) -> bool:
+        """Membership test with Leo's optimization; no forest is built."""
+        symbols = self._symbols(word)
+        chart = self._chart(symbols, leo=True)
+        return chart is not None and (1, 0) in chart[0][len(symbols)]
+
+    def parse(self, word: Word) -> Optional["Forest"]:
+        """
+        Return the shared packed parse forest of all parses of `word`, or
+        None if it is rejected. The chart is built without Leo items: the
+        completions they skip are exactly the nodes the forest needs.
+        """
+        symbols = self._symbols(word)
+        chart = self._chart(symbols, leo=False)
+        n = len(symbols)
+        if chart is None or (1, 0) not in chart[0][n]:
+            return None
+        sets = chart[0]
+        nxt, lhs, first = self._next, self._lhs, self._first
+
+        # done[j][A]: origins of the complete A-items in set j
+        done: List[Dict[str, Set[int]]] = []
+        for items in sets:
+            by_lhs: Dict[str, Set[int]] = {}
+            for dr, origin in items:
+                if nxt[dr] is None and dr > 1:
+                    by_lhs.setdefault(lhs[dr], set()).add(origin)
+            done.append(by_lhs)
+
+        root = (self.start, 0, n)
+        families: Dict[Node, List[Tuple]] = {}
+        todo = [root]
+        while todo:
+            node = todo.pop()
+            if node in families:
+                continue
+            head, i, j = node
+            out: List[Tuple] = []
+            if isinstance(head, str):
+                # symbol node: one family (rule end id, prefix node) per rule
+                for r in first.get(head, ()):
+                    end = r
+                    while nxt[end] is not None:
+                        end += 1
+                    if (end, i) not in sets[j]:
+                        continue
+                    child = (end, i, j) if end > r else None
+                    out.append((end, child))
+            else:
+                # prefix node: (shorter prefix or None, node for the symbol before the dot)
+                prev = head - 1
+                X = nxt[prev]
+                if X in self.nonterminals:
+                    splits = [k for k in done[j].get(X, ()) if k >= i]
+                else:
+                    splits = [j - 1] if j > i and symbols[j - 1] == X else []
+                for k in splits:
+                    if (prev, i) not in sets[k]:
+                        continue
+                    # the dot was at the start: nothing left of X
+                    left = None if nxt[prev - 1] is None else (prev, i, k)
+                    out.append((left, (X, k, j)))
+            families[node] = out
+            for family in out:
+                for child in family:
+                    # terminal leaves have no families and are not expanded
+                    if isinstance(child, tuple) and (child[0] in self.nonterminals
+                                                     or not isinstance(child[0], str)):
+                        todo.append(child)
+        return Forest(root, families)
+
+# ───────────────────────── Parse forest ─────────────────────────
+class Forest:
+    """
+    Shared packed parse forest. `families[node]` lists the alternative ways
+    (packed nodes) `node` was derived; every sub-span is stored once, so an
+    exponential number of trees fits in a cubic number of nodes. Rules are
+    binarized through prefix nodes, whose families are (left, right) pairs.
+    """
+
+    def __init__(self, root: Node, families: Dict[Node, List[Tuple]]):
+        self.root = root
+        self.families = families
+
+    def __len__(self) -> int:
+        return len(self.families)
+
+    def _children(self, family: Tuple) -> List[Node]:
+        return [c for c in family if isinstance(c, tuple) and c in self.families]
+
+    def _all_children(self, node: Node) -> List[Node]:
+        return [c for family in self.families[node] for c in self._children(family)]
+
+    def is_ambiguous(self) -> bool:
+        return any(len(fams) > 1 for fams in self.families.values())
+
+    def count(self) -> Union[int, float]:
+        """Number of distinct parse trees; inf when a cycle makes it unbounded."""
+        order: List[Node] = []
+        state: Dict[Node, int] = {self.root: 1}  # 1 = on the DFS path, 2 = finished
+        stack = [(self.root, iter(self._all_children(self.root)))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                seen = state.get(child)
+                if seen == 1:
+                    return float("inf")
+                if seen is None:
+                    state[child] = 1
+                    stack.append((child, iter(self._all_children(child))))
+                    break
+            else:
+                state[node] = 2
+                order.append(node)
+                stack.pop()
+        # post order: every child is counted before its parents
+        counts: Dict[Node, int] = {}
+        for node in order:
+            total = 0
+            for family in self.families[node]:
+                ways = 1
+                for child in self._children(family):
+                    ways *= counts[child]
+                total += ways
+            counts[node] = total
+        return counts[self.root]
+
+    def tree(self) -> Tree:
+        """
+        One parse tree. A family is chosen for each node only once all of its
+        children have one (counting worklist, like `_derivable`), so cyclic
+        forests still yield a finite tree.
+        """
+        parents: Dict[Node, List[List]] = {}
+        queue: List[Node] = []
+        for node, fams in self.families.items():
+            for family in fams:
+                children = self._children(family)
+                if not children:
+                    queue.append((node, family))
+                    continue
+                counter = [node, family, len(children)]
+                for child in children:
+                    parents.setdefault(child, []).append(counter)
+        chosen: Dict[Node, Tuple] = {}
+        while queue:
+            node, family = queue.pop()
+            if node in chosen:
+                continue
+            chosen[node] = family
+            for counter in parents.get(node, ()):
+                counter[2] -= 1
+                if not counter[2]:
+                    queue.append((counter[0], counter[1]))
+
+        built: Dict[Node, Tuple] = {}
+        stack = [self.root]
+        while stack:
+            node = stack[-1]
+            if node in built:
+                stack.pop()
+                continue
+            missing = [c for c in self._children(chosen[node]) if c not in built]
+            if missing:
+                stack += missing
+                continue
+            stack.pop()
+            built[node] = self._build(node, chosen[node], built)
+        return built[self.root]
+
+    def _build(self, node: Node, family: Tuple, built: Dict[Node, Tuple]) -> Tuple:
+        def sub(child: Node):
+            if child in built:
+                return built[child]
+            return child[0]  # terminal leaf
+        if isinstance(node[0], str):
+            _, prefix = family
+            return (node[0],) + (built[prefix] if prefix is not None else ())
+        left, right = family
+        return (built[left] if left is not None else ()) + (sub(right),)
+
+def pretty_tree(t: Tree, indent=0) -> str:
+    pad = "  " * indent
+    if len(t) == 1:
+        return f"{pad}{t[0]} → ε"
+    lines = [f"{pad}{t[0]}"]
+    for child in t[1:]:
+        lines.append(f"{pad}  {child}" if isinstance(child, str) else pretty_tree(child, indent + 1))
+    return "\n".join(lines)
+
+# ──────────────────────── Main: Variant 13 ────────────────────────
+if __name__ == "__main__":
+    variant13: List[str] = [
+        "S->aB", "S->DA", "A->a", "A->BD", "A->bDAB",
+        "B->b", "B->BA", "D->ε", "D->BA", "C->BA",
+    ]
+    earley = Earley(_parse(variant13), start="S")
+    for w in ["ab", "ba", "bba", "abab", "bbab", "aa", ""]:
+        print(f"'{w}': {'accepted' if earley.recognize(w) else 'rejected'}")
+
+    forest = earley.parse("bab")
+    print(f"\n'bab': {forest.count()} parse tree(s), {len(forest)} forest nodes")
+    print(pretty_tree(forest.tree()))
+
+    ambiguous = Earley(_parse(["S->SS|a"]))
+    forest = ambiguous.parse("a" * 20)
+    print(f"\nS → SS | a on a^20: {forest.count()} trees in {len(forest)} nodes")
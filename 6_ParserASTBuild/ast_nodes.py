@@ -2,9 +2,11 @@
 
 class ASTNode:
     """Base class for all AST nodes."""
-    pass
+    __slots__ = ()
 
 class Number(ASTNode):
+    __slots__ = ("value",)
+
     def __init__(self, value: float):
         self.value = value
 
@@ -12,6 +14,8 @@ class Number(ASTNode):
         return f"Number({self.value})"
 
 class Variable(ASTNode):
+    __slots__ = ("name",)
+
     def __init__(self, name: str):
         self.name = name
 
@@ -19,6 +23,8 @@ class Variable(ASTNode):
         return f"Var({self.name})"
 
 class BinaryOp(ASTNode):
+    __slots__ = ("op", "left", "right")
+
     def __init__(self, op: str, left: ASTNode, right: ASTNode):
         self.op = op
         self.left = left
@@ -28,6 +34,8 @@ class BinaryOp(ASTNode):
         return f"BinOp({self.op}, {self.left}, {self.right})"
 
 class UnaryOp(ASTNode):
+    __slots__ = ("op", "operand")
+
     def __init__(self, op: str, operand: ASTNode):
         self.op = op
         self.operand = operand
@@ -36,9 +44,86 @@ class UnaryOp(ASTNode):
         return f"UnOp({self.op}, {self.operand})"
 
 class FuncCall(ASTNode):
+    __slots__ = ("name", "argument")
+
     def __init__(self, name: str, argument: ASTNode):
         self.name = name
         self.argument = argument
 
     def __repr__(self):
         return f"FuncCall({self.name}, {self.argument})"
+
+
+# ───── Command nodes ─────
+
+class Command(ASTNode):
+    """Base class for parsed commands; OP names the game-state handler."""
+    __slots__ = ()
+    OP = ""
+
+    def operands(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __repr__(self):
+        args = ", ".join(repr(v) for v in self.operands())
+        return f"{type(self).__name__}({args})"
+
+class Move(Command):
+    __slots__ = ("amount", "direction")
+    OP = "move"
+
+    def __init__(self, amount, direction: str):
+        # a constant arrives as text ('10', '3.5'), anything else as an
+        # expression; integers stay exact instead of going through float
+        if not isinstance(amount, ASTNode):
+            try:
+                amount = int(amount)
+            except ValueError:
+                amount = float(amount)
+                if amount.is_integer():
+                    amount = int(amount)
+        self.amount = amount
+        self.direction = direction
+
+class Attack(Command):
+    __slots__ = ("action", "weapon")
+    OP = "attack"
+
+    def __init__(self, action: str, weapon: str = None):
+        self.action = action
+        self.weapon = weapon
+
+class Block(Command):
+    __slots__ = ("direction",)
+    OP = "block"
+
+    def __init__(self, direction: str = None):
+        self.direction = direction
+
+class Use(Command):
+    __slots__ = ("item", "target")
+    OP = "use"
+
+    def __init__(self, item: str, target: str):
+        self.item = item
+        self.target = target
+
+class Cast(Command):
+    __slots__ = ("spell", "target")
+    OP = "cast"
+
+    def __init__(self, spell: str, target: str = None):
+        self.spell = spell
+        self.target = target
+
+COMMAND_NODES = {
+    "MOVE": Move,
+    "ATTACK": Attack,
+    "BLOCK": Block,
+    "USE": Use,
+    "CAST": Cast,
+}
+
+def command_node(cmd: dict) -> Command:
+    """Build the typed node for a parsed {"command": ..., "args": [...]} dict."""
+    return COMMAND_NODES[cmd["command"]](*cmd["args"])
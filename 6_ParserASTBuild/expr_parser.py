@@ -0,0 +1,191 @@
+# src/expr_parser.py
+
+import math
+import operator
+
+if __package__:
+    from .ast_nodes import ASTNode, Number, Variable, BinaryOp, UnaryOp, FuncCall
+    from .tokens import TokenType
+else:  # run as a script from this folder
+    from ast_nodes import ASTNode, Number, Variable, BinaryOp, UnaryOp, FuncCall
+    from tokens import TokenType
+
+# tokens an expression can start with (used by the LL(1) table)
+EXPR_FIRST = (TokenType.NUMBER, TokenType.IDENTIFIER, TokenType.LPAREN, TokenType.OPERATOR)
+
+# binding power and associativity of binary operators
+BINARY = {
+    '+': (10, 'left'),
+    '-': (10, 'left'),
+    '*': (20, 'left'),
+    '/': (20, 'left'),
+    '%': (20, 'left'),
+    '^': (40, 'right'),
+}
+UNARY_POWER = 30  # -x^2 == -(x^2), but -x*y == (-x)*y
+
+# deepest nesting of parentheses, signs, calls and right operands; deeper
+# input is a syntax error rather than a RecursionError
+MAX_DEPTH = 200
+
+_APPLY = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '%': operator.mod,
+    '^': operator.pow,
+}
+
+# name -> (scalar implementation, NumPy ufunc name)
+FUNCTIONS = {
+    'abs':   (abs, 'abs'),
+    'sqrt':  (math.sqrt, 'sqrt'),
+    'sin':   (math.sin, 'sin'),
+    'cos':   (math.cos, 'cos'),
+    'floor': (math.floor, 'floor'),
+    'ceil':  (math.ceil, 'ceil'),
+}
+
+# ───── Constant folding ─────
+
+# folding never builds an integer wider than this; bigger constants such as
+# 9^64^64 are left in the tree for run time
+MAX_FOLD_BITS = 4096
+
+def _fold(fn, *args):
+    """
+    Apply `fn` to constant operands, or return None if it fails (e.g. 1/0) or
+    its result is not a constant we can write: complex ((0-8)^(1/2)), inf or
+    nan from float overflow, or an integer wider than MAX_FOLD_BITS.
+    """
+    try:
+        value = fn(*(a.value for a in args))
+    except (ArithmeticError, ValueError):
+        return None
+    if isinstance(value, int):
+        if value.bit_length() > MAX_FOLD_BITS:
+            return None
+    elif not isinstance(value, float) or not math.isfinite(value):
+        return None
+    return Number(value)
+
+def _too_big(op, a, b):
+    """Upper bound check, before computing: would `a op b` pass MAX_FOLD_BITS?"""
+    if not (isinstance(a, int) and isinstance(b, int)):
+        return False  # float results are checked by _fold
+    if op == '*':
+        return a.bit_length() + b.bit_length() > MAX_FOLD_BITS
+    if op == '^':
+        return b > 0 and a.bit_length() * b > MAX_FOLD_BITS
+    return False
+
+def binary(op, left, right):
+    if (isinstance(left, Number) and isinstance(right, Number)
+            and not _too_big(op, left.value, right.value)):
+        folded = _fold(_APPLY[op], left, right)
+        if folded is not None:
+            return folded
+    return BinaryOp(op, left, right)
+
+def unary(op, operand):
+    if isinstance(operand, Number):
+        return Number(-operand.value if op == '-' else operand.value)
+    return UnaryOp(op, operand)
+
+def call(name, argument):
+    if isinstance(argument, Number):
+        folded = _fold(FUNCTIONS[name][0], argument)
+        if folded is not None:
+            return folded
+    return FuncCall(name, argument)
+
+# ───── Pratt parser ─────
+
+def parse_expression(parser, min_power=0, depth=0) -> ASTNode:
+    """
+    Precedence-climbing parse of an arithmetic expression from the parser's
+    token stream (parser.current / parser.advance()). Constant subtrees are
+    folded as they are built. `depth` counts the enclosing nested operands,
+    bounded by MAX_DEPTH.
+    """
+    if depth > MAX_DEPTH:
+        raise SyntaxError(f"Expression nested too deeply (over {MAX_DEPTH} levels)")
+    tok = parser.current
+    if tok.type == TokenType.NUMBER:
+        parser.advance()
+        try:
+            left = Number(int(tok.value))
+        except ValueError:  # over the int() digit limit
+            raise SyntaxError(f"Number too large ({len(tok.value)} digits)") from None
+    elif tok.type == TokenType.IDENTIFIER:
+        parser.advance()
+        if parser.current.type == TokenType.LPAREN:
+            if tok.value not in FUNCTIONS:
+                raise SyntaxError(f"Unknown function '{tok.value}'")
+            parser.advance()
+            argument = parse_expression(parser, 0, depth + 1)
+            parser.eat(TokenType.RPAREN)
+            left = call(tok.value, argument)
+        else:
+            left = Variable(tok.value)
+    elif tok.type == TokenType.LPAREN:
+        parser.advance()
+        left = parse_expression(parser, 0, depth + 1)
+        parser.eat(TokenType.RPAREN)
+    elif tok.type == TokenType.OPERATOR and tok.value in '+-':
+        parser.advance()
+        left = unary(tok.value, parse_expression(parser, UNARY_POWER, depth + 1))
+    else:
+        raise SyntaxError(f"Expected expression, got {tok.type.name}")
+
+    while parser.current.type == TokenType.OPERATOR:
+        op = parser.current.value
+        power, assoc = BINARY[op]
+        if power <= min_power:
+            break
+        parser.advance()
+        right = parse_expression(parser, power if assoc == 'left' else power - 1, depth + 1)
+        left = binary(op, left, right)
+    return left
+
+# ───── Compiled evaluation ─────
+
+def _source(node) -> str:
+    if isinstance(node, Number):
+        return repr(node.value)
+    if isinstance(node, Variable):
+        return f"env[{node.name!r}]"
+    if isinstance(node, UnaryOp):
+        return f"({node.op}{_source(node.operand)})"
+    if isinstance(node, BinaryOp):
+        op = '**' if node.op == '^' else node.op
+        return f"({_source(node.left)} {op} {_source(node.right)})"
+    if isinstance(node, FuncCall):
+        return f"fn[{node.name!r}]({_source(node.argument)})"
+    raise TypeError(f"Cannot compile {node!r}")
+
+def compile_expr(node, vectorized=False):
+    """
+    Compile an expression tree into a Python function of `env` (a mapping of
+    variable names to values). With `vectorized`, functions map to NumPy
+    ufuncs, so binding variables to arrays evaluates the expression for every
+    element in one pass.
+    """
+    if vectorized:
+        import numpy as np
+        fn = {name: getattr(np, ufunc) for name, (_, ufunc) in FUNCTIONS.items()}
+    else:
+        fn = {name: impl for name, (impl, _) in FUNCTIONS.items()}
+    code = compile(f"lambda env: {_source(node)}", "<expr>", "eval")
+    return eval(code, {"__builtins__": {}, "fn": fn})
+
+def constant_value(node):
+    """Folded constant as it would have been written: '10', '2.5'."""
+    value = node.value
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    try:
+        return str(value)
+    except ValueError:  # over the int → str digit limit
+        raise SyntaxError("Constant too large") from None
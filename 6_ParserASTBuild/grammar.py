@@ -0,0 +1,63 @@
+# src/grammar.py
+
+if __package__:
+    from .tokens import TokenType
+else:  # run as a script from this folder
+    from tokens import TokenType
+
+# Declarative command language. Each line is one command:
+#   - a word naming a TokenType (NUMBER, DIRECTION, ...) matches any token of
+#     that type and becomes an argument,
+#   - Expr is an arithmetic expression (see expr_parser),
+#   - any other word (MOVE, with, on, ...) must appear literally,
+#   - [ ... ] marks an optional part.
+# New commands only need a new line here.
+COMMANDS = [
+    "MOVE Expr DIRECTION",
+    "ATTACK ACTION [with WEAPON]",
+    "BLOCK [DIRECTION]",
+    "USE ITEM on TARGET",
+    "CAST SPELL [on TARGET]",
+]
+
+def _symbol(word):
+    return TokenType[word] if word in TokenType.__members__ else word
+
+def build_grammar(commands=COMMANDS):
+    """
+    Expand the command specs into a context-free grammar:
+        Script  -> Command Script | ε
+        Command -> <one alternative per spec>
+    Every [ ... ] becomes a fresh nonterminal OptN -> ... | ε.
+    Symbols are nonterminal names (keys of the result), TokenType members or
+    literal lexemes.
+    """
+    grammar = {"Script": [["Command", "Script"], []], "Command": []}
+
+    def sequence(words):
+        out = []
+        while words:
+            word = words.pop(0)
+            if word.startswith("["):
+                # collect the optional group up to its closing bracket
+                inner, depth = [], 0
+                words.insert(0, word)
+                while words:
+                    w = words.pop(0)
+                    depth += w.count("[") - w.count("]")
+                    inner.append(w)
+                    if depth == 0:
+                        break
+                inner[0] = inner[0][1:]
+                inner[-1] = inner[-1][:-1]
+                name = f"Opt{len(grammar) - 1}"
+                grammar[name] = []
+                grammar[name].extend([sequence([w for w in inner if w]), []])
+                out.append(name)
+            else:
+                out.append(_symbol(word))
+        return out
+
+    for spec in commands:
+        grammar["Command"].append(sequence(spec.split()))
+    return grammar
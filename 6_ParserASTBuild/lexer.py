@@ -1,64 +1,63 @@
 # src/lexer.py
 
-import re
-from tokens import TokenType
+import os
+import sys
+
+if __package__:
+    from ..lexing import LexerSpec
+    from .tokens import TokenType
+else:  # run as a script: make the repository root (and lfa) importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from lfa.lexing import LexerSpec
+    from tokens import TokenType
 
 class Token:
-    def __init__(self, type_: TokenType, value):
+    def __init__(self, type_: TokenType, value, line=None):
         self.type = type_
         self.value = value
+        self.line = line
 
     def __repr__(self):
         return f"Token({self.type.name}, '{self.value}')"
 
+SPEC = LexerSpec([
+    (r'#.*',                   TokenType.COMMENT),
+    (r'\b(MOVE|ATTACK|BLOCK|USE|CAST)\b', TokenType.COMMAND),
+    (r'\b(forward|back|left|right)\b',    TokenType.DIRECTION),
+    (r'\b(slash|punch|kick|shoot)\b',     TokenType.ACTION),
+    (r'\b(sword|bow|dagger)\b',           TokenType.WEAPON),
+    (r'\b(potion|elixir|scroll)\b',       TokenType.ITEM),
+    (r'\b(fireball|heal|shield|icebolt)\b', TokenType.SPELL),
+    (r'\b(self|enemy|allies|ally)\b',     TokenType.TARGET),
+    (r'\b(with|on)\b',                    TokenType.KEYWORD),
+    (r'\b\d+\b',                          TokenType.NUMBER),
+    (r'\b[A-Za-z_]\w*\b',                 TokenType.IDENTIFIER),
+    (r'[-+*/%^]',                         TokenType.OPERATOR),
+    (r'\(',                               TokenType.LPAREN),
+    (r'\)',                               TokenType.RPAREN),
+], token=Token, eof=TokenType.EOF, skip=(TokenType.COMMENT,))
+
 class Lexer:
-    def __init__(self, text):
+    """Lexes one text with a shared LexerSpec (SPEC by default)."""
+
+    def __init__(self, text, spec=SPEC):
         self.text = text
+        self.spec = spec
         self.tokens = []
         self.errors = []
-        self.patterns = [
-            (r'#.*',                   TokenType.COMMENT),
-            (r'\b(MOVE|ATTACK|BLOCK|USE|CAST)\b', TokenType.COMMAND),
-            (r'\b(forward|back|left|right)\b',    TokenType.DIRECTION),
-            (r'\b(slash|punch|kick|shoot)\b',     TokenType.ACTION),
-            (r'\b(sword|bow|dagger)\b',           TokenType.WEAPON),
-            (r'\b(potion|elixir|scroll)\b',       TokenType.ITEM),
-            (r'\b(fireball|heal|shield|icebolt)\b', TokenType.SPELL),
-            (r'\b(self|enemy|allies|ally)\b',     TokenType.TARGET),
-            (r'\b(with|on)\b',                    TokenType.KEYWORD),
-            (r'\b\d+\b',                          TokenType.NUMBER),
-            (r'\b[A-Za-z_]\w*\b',                 TokenType.IDENTIFIER),
-        ]
 
-    def tokenize(self):
-        lines = self.text.split('\n')
-        for line_number, line in enumerate(lines, start=1):
-            original = line
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
+    @property
+    def patterns(self):
+        return self.spec.patterns
 
-            while line:
-                matched = False
-                for pattern, ttype in self.patterns:
-                    regex = re.compile(pattern)
-                    m = regex.match(line)
-                    if m:
-                        val = m.group(0)
-                        if ttype != TokenType.COMMENT:
-                            self.tokens.append(Token(ttype, val))
-                        line = line[len(val):].lstrip()
-                        matched = True
-                        break
-
-                if not matched:
-                    bad = re.match(r'\S+', line).group(0)
-                    self.errors.append(
-                        f"Line {line_number}: Unexpected token '{bad}' in: {original.strip()}"
-                    )
-                    line = line[len(bad):].lstrip()
+    def iter_tokens(self):
+        """Lazy tokenize(): self.errors fills up as the lines are reached."""
+        self.errors = []
+        return self.spec.iter_tokens(self.text, self.errors)
 
-        self.tokens.append(Token(TokenType.EOF, None))
+    def tokenize(self):
+        # replaces the previous result, so calling it twice is harmless
+        self.tokens, self.errors = self.spec.tokenize(self.text)
         return self.tokens
 
     def has_errors(self):
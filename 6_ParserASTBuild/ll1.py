@@ -0,0 +1,141 @@
+# src/ll1.py
+
+if __package__:
+    from .tokens import TokenType
+else:  # run as a script from this folder
+    from tokens import TokenType
+
+class LL1Table:
+    """
+    LL(1) parse table for a grammar as produced by grammar.build_grammar.
+
+    Columns are token classes: one per TokenType plus one per literal lexeme
+    the grammar mentions (command names and keywords), so a token is mapped to
+    its column with a single dict lookup and the production to apply is
+    table[nonterminal][column]. FIRST/FOLLOW and the table are computed once.
+    """
+
+    def __init__(self, grammar, start, externals=None):
+        # externals: name -> token types it can start with; such symbols are
+        # parsed by the parser itself (parser.external(name)), e.g. expressions
+        self.grammar = grammar
+        self.start = start
+        self.externals = dict(externals or {})
+        self.nonterminals = list(grammar)
+        self.index = {A: i for i, A in enumerate(self.nonterminals)}
+
+        literals = sorted({
+            s for alts in grammar.values() for alt in alts for s in alt
+            if isinstance(s, str) and s not in grammar and s not in self.externals
+        })
+        self.type_col = {t: i for i, t in enumerate(TokenType)}
+        self.literal_col = {w: len(TokenType) + i for i, w in enumerate(literals)}
+        self.columns = list(TokenType) + literals
+
+        self.productions = [(A, alt) for A in self.nonterminals for alt in grammar[A]]
+        self.first = self._first_sets()
+        self.follow = self._follow_sets()
+        self.table = self._build_table()
+
+    # ───── FIRST / FOLLOW ─────
+    def _terminal_col(self, sym):
+        return self.type_col[sym] if isinstance(sym, TokenType) else self.literal_col[sym]
+
+    def first_of(self, seq, first=None):
+        """(columns that can start `seq`, whether `seq` can derive ε)"""
+        first = self.first if first is None else first
+        out = set()
+        for sym in seq:
+            if sym in self.index:
+                cols, nullable = first[sym]
+                out |= cols
+                if not nullable:
+                    return out, False
+            elif sym in self.externals:
+                out.update(self.type_col[t] for t in self.externals[sym])
+                return out, False
+            else:
+                out.add(self._terminal_col(sym))
+                return out, False
+        return out, True
+
+    def _first_sets(self):
+        first = {A: (set(), False) for A in self.nonterminals}
+        changed = True
+        while changed:
+            changed = False
+            for A, alt in self.productions:
+                cols, nullable = self.first_of(alt, first)
+                old_cols, old_nullable = first[A]
+                if not cols <= old_cols or (nullable and not old_nullable):
+                    first[A] = (old_cols | cols, old_nullable or nullable)
+                    changed = True
+        return first
+
+    def _follow_sets(self):
+        follow = {A: set() for A in self.nonterminals}
+        follow[self.start].add(self.type_col[TokenType.EOF])
+        changed = True
+        while changed:
+            changed = False
+            for A, alt in self.productions:
+                for i, sym in enumerate(alt):
+                    if sym not in self.index:
+                        continue
+                    cols, nullable = self.first_of(alt[i + 1:])
+                    if nullable:
+                        cols = cols | follow[A]
+                    if not cols <= follow[sym]:
+                        follow[sym] |= cols
+                        changed = True
+        return follow
+
+    def _build_table(self):
+        table = [[-1] * len(self.columns) for _ in self.nonterminals]
+        for p, (A, alt) in enumerate(self.productions):
+            cols, nullable = self.first_of(alt)
+            if nullable:
+                cols = cols | self.follow[A]
+            row = table[self.index[A]]
+            for c in cols:
+                if row[c] not in (-1, p):
+                    raise ValueError(
+                        f"Grammar is not LL(1): {A} has two productions on {self.columns[c]}"
+                    )
+                row[c] = p
+        return table
+
+    # ───── Driver ─────
+    def column(self, token):
+        col = self.literal_col.get(token.value)
+        return self.type_col[token.type] if col is None else col
+
+    @staticmethod
+    def describe(sym):
+        return sym.name if isinstance(sym, TokenType) else f"'{sym}'"
+
+    def run(self, nonterminal, parser):
+        """
+        Expand `nonterminal` against the parser's token stream (parser.current
+        / parser.advance()) and return the matched (terminal, token) pairs;
+        external symbols contribute (name, parser.external(name)).
+        """
+        matched = []
+        stack = [nonterminal]
+        while stack:
+            sym = stack.pop()
+            tok = parser.current
+            row = self.index.get(sym) if isinstance(sym, str) else None
+            if row is not None:
+                p = self.table[row][self.column(tok)]
+                if p < 0:
+                    raise SyntaxError(f"Unexpected {tok.type.name} '{tok.value}' in {sym}")
+                stack.extend(reversed(self.productions[p][1]))
+            elif sym in self.externals:
+                matched.append((sym, parser.external(sym)))
+            elif tok.type == sym or (isinstance(sym, str) and tok.value == sym):
+                matched.append((sym, tok))
+                parser.advance()
+            else:
+                raise SyntaxError(f"Expected {self.describe(sym)}, got {tok.type.name}")
+        return matched
@@ -0,0 +1,120 @@
+# src/loadgen.py
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+if __package__:
+    from .server import ValidationServer
+else:  # run as a script from this folder
+    from server import ValidationServer
+
+VALID = [
+    "MOVE 10 forward",
+    "MOVE 2 * (3 + 4) left",
+    "ATTACK slash with sword",
+    "BLOCK left",
+    "USE potion on self",
+    "CAST fireball on enemy",
+]
+INVALID = [
+    "MOVE forward",
+    "SLASH enemy",
+    "USE potion",
+]
+
+def make_script(rng, lines, invalid_rate):
+    pool = INVALID if rng.random() < invalid_rate else VALID
+    return "\n".join(rng.choice(VALID) for _ in range(lines - 1)) + "\n" + rng.choice(pool)
+
+async def _client(connect, requests, window, rng, lines, invalid_rate, latencies, outcomes):
+    """One connection: keeps up to `window` requests in flight (pipelining)."""
+    reader, writer = await connect()
+    sent_at = {}
+    slots = asyncio.Semaphore(window)
+
+    async def send():
+        for i in range(requests):
+            await slots.acquire()
+            sent_at[i] = time.perf_counter()
+            msg = {"id": i, "script": make_script(rng, lines, invalid_rate)}
+            writer.write(json.dumps(msg).encode() + b"\n")
+            await writer.drain()
+
+    sender = asyncio.create_task(send())
+    done = 0
+    while done < requests:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        reply = json.loads(line)
+        if not reply.get("done"):
+            continue  # a streamed command line
+        latencies.append(time.perf_counter() - sent_at.pop(reply["id"]))
+        key = "ok" if reply["ok"] else reply["stage"]
+        outcomes[key] = outcomes.get(key, 0) + 1
+        done += 1
+        slots.release()
+    await sender
+    writer.close()
+    await writer.wait_closed()
+
+async def run_load(connect, connections=8, requests=200, window=4, lines=20,
+                   invalid_rate=0.1, seed=0):
+    rng = random.Random(seed)
+    latencies, outcomes = [], {}
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _client(connect, requests, window, rng, lines, invalid_rate, latencies, outcomes)
+        for _ in range(connections)
+    ))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    pct = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+    return {
+        "requests": len(latencies),
+        "seconds": round(elapsed, 3),
+        "req_per_sec": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(pct(0.50), 2),
+        "p99_ms": round(pct(0.99), 2),
+        "max_ms": round(latencies[-1] * 1000, 2),
+        "outcomes": outcomes,
+    }
+
+async def main(args):
+    server = None
+    if args.unix:
+        connect = lambda: asyncio.open_unix_connection(args.unix, limit=16 << 20)
+    elif args.port:
+        connect = lambda: asyncio.open_connection(args.host, args.port, limit=16 << 20)
+    else:
+        # no address given: benchmark an in-process server on a free port
+        server = ValidationServer(workers=args.workers, queue_size=args.queue)
+        await server.start(args.host, 0)
+        host, port = server.address[:2]
+        connect = lambda: asyncio.open_connection(host, port, limit=16 << 20)
+    try:
+        report = await run_load(connect, args.connections, args.requests, args.window,
+                                args.lines, args.invalid_rate, args.seed)
+    finally:
+        if server is not None:
+            await server.close()
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Load generator for the validation server")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=0, help="0 = start a local server")
+    ap.add_argument("--unix", help="connect to this Unix socket instead of TCP")
+    ap.add_argument("--connections", type=int, default=8)
+    ap.add_argument("--requests", type=int, default=200, help="per connection")
+    ap.add_argument("--window", type=int, default=4, help="in-flight requests per connection")
+    ap.add_argument("--lines", type=int, default=20, help="commands per script")
+    ap.add_argument("--invalid-rate", type=float, default=0.1)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workers", type=int, default=None, help="local server only")
+    ap.add_argument("--queue", type=int, default=256, help="local server only")
+    asyncio.run(main(ap.parse_args()))
@@ -1,8 +1,17 @@
 # src/main.py
 
-from lexer import Lexer, Token
-from parser import Parser
-from tokens import TokenType
+if __package__:
+    from .lexer import Lexer, Token
+    from .parse_cache import ParseCache
+    from .parser import Parser
+    from .tokens import TokenType
+    from .vm import VM, compile_script
+else:  # run as a script from this folder
+    from lexer import Lexer, Token
+    from parse_cache import ParseCache
+    from parser import Parser
+    from tokens import TokenType
+    from vm import VM, compile_script
 
 def display_tokens(tokens):
     print("Tokens:")
@@ -16,47 +25,63 @@ def display_commands(cmds):
         name = cmd["command"]
         args = cmd["args"]
         if args:
-            arg_str = ", ".join(args)
+            arg_str = ", ".join(str(a) for a in args)
         else:
             arg_str = "(no arguments)"
         print(f"  {i}. {name} → {arg_str}")
     print()
 
+# identical scripts and REPL lines are lexed and parsed only once
+PARSE_CACHE = ParseCache(maxsize=1024)
+
 def run_script(script: str):
     print("\n=== Script ===")
     print(script.strip(), "\n")
 
-    # 1) Lexing
-    lexer = Lexer(script)
-    tokens = lexer.tokenize()
-    if lexer.has_errors():
+    # 1) Lexing + 2) Parsing, both memoized
+    result = PARSE_CACHE.get(script)
+    if result.lex_errors:
         print("Lexing errors:")
-        lexer.print_errors()
-        return
+        for err in result.lex_errors:
+            print("[ERROR]", err)
+        print()
 
-    display_tokens(tokens)
+    display_tokens(result.tokens)
+    display_commands(result.commands)
 
-    # 2) Parsing
-    try:
-        parser = Parser(script)
-        commands = parser.parse()
-    except SyntaxError as e:
-        print("Parsing error:", e)
+    if result.parse_errors:
+        print("Parsing errors:")
+        for err in result.parse_errors:
+            print("[ERROR]", err)
+    if result.lex_errors or result.parse_errors:
         return
 
-    display_commands(commands)
+    # 3) Executing: expressions are only evaluated here, against an empty
+    # variable table, so a free variable or 1/0 is reported like the above
+    try:
+        state = VM().run(compile_script(result.commands))
+    except KeyError as e:
+        error = f"Unbound variable '{e.args[0]}'"
+    except (ArithmeticError, TypeError, ValueError) as e:
+        error = f"{type(e).__name__}: {e}"
+    else:
+        print("Final state:", state, "\n")
+        return
+    print("Runtime errors:")
+    print("[ERROR]", error)
 
 if __name__ == "__main__":
     # Example scripts
     scripts = {
         "Movement & Combat": """
-            MOVE forward
-            ATTACK with sword on enemy
+            MOVE 10 forward
+            MOVE 2 * (3 + 4) left
+            ATTACK slash with sword
             BLOCK left
         """,
         "Usage & Casting": """
             USE potion on self
-            CAST fireball on all
+            CAST fireball on allies
             SLASH enemy
         """
     }
@@ -72,3 +97,5 @@ if __name__ == "__main__":
         if not line or line.lower() == "exit":
             break
         run_script(line)
+
+    print("Parse cache:", PARSE_CACHE.stats())
@@ -0,0 +1,78 @@
+# src/parse_cache.py
+
+import hashlib
+from collections import OrderedDict, namedtuple
+from types import MappingProxyType
+
+if __package__:
+    from .lexer import SPEC
+    from .parser import Parser
+else:  # run as a script from this folder
+    from lexer import SPEC
+    from parser import Parser
+
+# Immutable outcome of lexing + parsing one script in a single recovering
+# pass (see Parser(recover=True)):
+#   lex_errors   - tuple of lexer messages (empty if lexing succeeded)
+#   parse_errors - tuple of syntax error messages (empty if parsing succeeded)
+#   commands     - tuple of read-only {"command", "args"} mappings for every
+#                  command that parsed; partial when there were errors
+ParseResult = namedtuple("ParseResult", "tokens lex_errors parse_errors commands")
+
+def _freeze(cmd):
+    return MappingProxyType({"command": cmd["command"], "args": tuple(cmd["args"])})
+
+def parse_script(script: str) -> ParseResult:
+    # the shared spec keeps no state, so this is safe from any thread
+    lexed = SPEC.tokenize(script)
+    tokens = tuple(lexed.tokens)
+    parser = Parser(tokens, recover=True)
+    commands = tuple(_freeze(c) for c in parser.parse())
+    return ParseResult(tokens, tuple(lexed.errors), tuple(parser.errors), commands)
+
+class ParseCache:
+    """
+    Bounded LRU of ParseResult keyed by script text. Scripts longer than
+    `hash_threshold` characters are keyed by their BLAKE2b digest instead, so
+    the cache does not pin large texts. Failed results are cached as well,
+    so known-bad input is rejected without lexing it again.
+    """
+
+    def __init__(self, maxsize=1024, hash_threshold=4096):
+        self.maxsize = maxsize
+        self.hash_threshold = hash_threshold
+        self._entries = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    def _key(self, script: str):
+        if len(script) > self.hash_threshold:
+            return hashlib.blake2b(script.encode(), digest_size=20).digest()
+        return script
+
+    def get(self, script: str) -> ParseResult:
+        key = self._key(script)
+        result = self._entries.get(key)
+        if result is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return result
+
+        self.misses += 1
+        result = self._entries[key] = parse_script(script)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return result
+
+    def stats(self):
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
@@ -1,24 +1,72 @@
 # src/parser.py
 
-from tokens import TokenType
-from lexer import Lexer, Token
+if __package__:
+    from .tokens import TokenType
+    from .lexer import Lexer, Token
+    from .ast_nodes import Number, command_node
+    from .expr_parser import EXPR_FIRST, constant_value, parse_expression
+    from .grammar import build_grammar
+    from .ll1 import LL1Table
+else:  # run as a script from this folder
+    from tokens import TokenType
+    from lexer import Lexer, Token
+    from ast_nodes import Number, command_node
+    from expr_parser import EXPR_FIRST, constant_value, parse_expression
+    from grammar import build_grammar
+    from ll1 import LL1Table
+
+# built once at import: FIRST/FOLLOW sets and the dense parse table
+COMMAND_TABLE = LL1Table(build_grammar(), "Script", externals={"Expr": EXPR_FIRST})
 
 class Parser:
-    def __init__(self, text: str):
-        self.lexer = Lexer(text)
-        self.tokens = self.lexer.tokenize()
-        if self.lexer.has_errors():
-            self.lexer.print_errors()
-            raise SyntaxError("Lexer errors encountered")
+    def __init__(self, source, recover=False):
+        """
+        `source` is script text, which is lexed here; a Lexer, whose tokens
+        are streamed with one token of lookahead; or an already lexed token
+        list / lazy token iterator.
+
+        By default the first lexer or syntax error raises SyntaxError. With
+        `recover`, errors are collected in self.errors instead: a failing
+        command is skipped up to the next COMMAND token or line, and parsing
+        goes on, so one pass reports every error and returns the commands
+        that did parse. A bare token list or iterator carries no lexer
+        errors: the caller has to check those itself (as parse_script does).
+        """
+        self.recover = recover
+        self.errors = []
+        if isinstance(source, str):
+            self.lexer = Lexer(source)
+            tokens = self.lexer.tokenize()
+            if self.lexer.has_errors():
+                if not recover:
+                    self.lexer.print_errors()
+                    raise SyntaxError("Lexer errors encountered")
+                self.errors.extend(self.lexer.errors)
+        elif isinstance(source, Lexer):
+            # errors show up in source.errors as their line is lexed
+            self.lexer = source
+            tokens = source.iter_tokens()
+        else:
+            self.lexer = None
+            tokens = source
+        self._seen_errors = len(self.lexer.errors) if self.lexer else 0
+        self.tokens = iter(tokens)
         self.pos = 0
-        self.current = self.tokens[0]
+        self.current = self._next_token()
+
+    def _next_token(self):
+        tok = next(self.tokens, Token(TokenType.EOF, None))
+        if self.lexer is not None and len(self.lexer.errors) > self._seen_errors:
+            new = self.lexer.errors[self._seen_errors:]
+            self._seen_errors = len(self.lexer.errors)
+            if not self.recover:
+                raise SyntaxError(new[0])
+            self.errors.extend(new)
+        return tok
 
     def advance(self):
         self.pos += 1
-        if self.pos < len(self.tokens):
-            self.current = self.tokens[self.pos]
-        else:
-            self.current = Token(TokenType.EOF, None)
+        self.current = self._next_token()
 
     def eat(self, ttype: TokenType):
         if self.current.type == ttype:
@@ -26,41 +74,60 @@ class Parser:
         else:
             raise SyntaxError(f"Expected {ttype.name}, got {self.current.type.name}")
 
-    def parse(self):
-        commands = []
+    def iter_commands(self):
+        """Yield commands one at a time, holding only the current one."""
         while self.current.type != TokenType.EOF:
-            commands.append(self.command())
-        return commands
-
-    def command(self):
-        # 1) COMMAND
-        cmd = self.current
-        self.eat(TokenType.COMMAND)
-
-        args = []
-        # 2) parse any number of arguments, either prefixed or bare
-        while True:
-            if self.current.type == TokenType.KEYWORD:
-                # prefixed: KEYWORD + arg
-                self.eat(TokenType.KEYWORD)
-                if self.current.type in {
-                    TokenType.DIRECTION, TokenType.ACTION, TokenType.WEAPON,
-                    TokenType.ITEM, TokenType.SPELL, TokenType.TARGET,
-                    TokenType.NUMBER, TokenType.IDENTIFIER,
-                }:
-                    args.append(self.current.value)
-                    self.advance()
-                else:
-                    raise SyntaxError(f"Unexpected argument after keyword: {self.current}")
-            elif self.current.type in {
-                TokenType.DIRECTION, TokenType.ACTION, TokenType.WEAPON,
-                TokenType.ITEM, TokenType.SPELL, TokenType.TARGET,
-                TokenType.NUMBER, TokenType.IDENTIFIER,
-            }:
-                # bare argument (only if none yet, or you could allow multiple)
-                args.append(self.current.value)
-                self.advance()
+            if not self.recover:
+                yield self.command()
+                continue
+            start, line = self.pos, self.current.line
+            try:
+                cmd = self.command()
+            except SyntaxError as e:
+                # report where it went wrong, unless the command was merely
+                # cut short by the next one (or EOF): then where it started
+                if self.pos == start or self.current.type not in (TokenType.COMMAND, TokenType.EOF):
+                    line = self.current.line
+                self.errors.append(f"Line {line}: {e}" if line is not None else str(e))
+                self.synchronize(start)
             else:
+                yield cmd
+
+    def synchronize(self, start):
+        """
+        Panic-mode recovery: drop tokens until a COMMAND or a token on another
+        line than the error. At least one token is dropped when the error is
+        on the command's first token, so parsing always makes progress.
+        """
+        line = self.current.line
+        while self.current.type != TokenType.EOF:
+            if self.pos > start and (
+                self.current.type == TokenType.COMMAND or self.current.line != line
+            ):
                 break
+            self.advance()
+
+    def parse(self):
+        return list(self.iter_commands())
 
-        return {"command": cmd.value, "args": args}
+    def iter_nodes(self):
+        """Like iter_commands, but yield typed command nodes (see ast_nodes)."""
+        for cmd in self.iter_commands():
+            yield command_node(cmd)
+
+    def external(self, name):
+        # the only external symbol is Expr
+        return parse_expression(self)
+
+    def command(self):
+        # one table-driven expansion of Command; arguments are the tokens
+        # matched by a token type (literals are the command name and keywords)
+        # and expressions, kept as text when they fold to a constant
+        matched = COMMAND_TABLE.run("Command", self)
+        args = []
+        for sym, value in matched[1:]:
+            if isinstance(sym, TokenType):
+                args.append(value.value)
+            elif sym in COMMAND_TABLE.externals:
+                args.append(constant_value(value) if isinstance(value, Number) else value)
+        return {"command": matched[0][1].value, "args": args}
@@ -0,0 +1,239 @@
+# src/server.py
+
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+if __package__:
+    from .parse_cache import parse_script
+else:  # run as a script from this folder
+    from parse_cache import parse_script
+
+def validate(script: str) -> dict:
+    """
+    Lex and parse one script (runs in a worker process). Returns a plain,
+    JSON-ready dict {"ok", "commands", "errors"}; commands are the ones that
+    parsed, errors every lexer and syntax error found in the same pass, and
+    "stage" ("lex" or "parse") names the first failing phase.
+    """
+    result = parse_script(script)
+    out = {
+        "ok": not (result.lex_errors or result.parse_errors),
+        "commands": [
+            {"command": c["command"], "args": [str(a) for a in c["args"]]}
+            for c in result.commands
+        ],
+        "errors": list(result.lex_errors + result.parse_errors),
+    }
+    if not out["ok"]:
+        out["stage"] = "lex" if result.lex_errors else "parse"
+    return out
+
+class _Connection:
+    """Per-client writer; whole responses are written under one lock."""
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.lock = asyncio.Lock()
+        self.pending = 0
+        self.idle = asyncio.Event()
+        self.idle.set()
+
+    async def send(self, messages):
+        async with self.lock:
+            for msg in messages:
+                self.writer.write(json.dumps(msg).encode() + b"\n")
+            # waits while the client is not reading: output backpressure
+            await self.writer.drain()
+
+class ValidationServer:
+    """
+    Line-delimited JSON validation service.
+
+    Request:  {"id": ..., "script": "..."}
+    Response: one {"id", "command"} line per parsed command followed by
+              {"id", "done": true, "ok": true, "count": n}; if the script
+              has errors, the commands that parsed are still streamed and
+              the last line is {"id", "done": true, "ok": false, "count",
+              "stage", "errors"} listing all of them.
+
+    Requests go into one bounded queue; when it is full, connections stop
+    being read, so TCP flow control pushes back on clients. `concurrency`
+    dispatchers hand work to a process pool and give up on a request after
+    `timeout` seconds. A running pool task cannot be cancelled, so after a
+    timeout the pool is replaced and its worker processes are terminated;
+    otherwise a few slow scripts would keep every worker busy. Requests
+    that were running in the old pool are retried once in the new one.
+    """
+
+    def __init__(self, workers=None, queue_size=256, concurrency=None, timeout=5.0,
+                 max_line=16 << 20):
+        self.workers = workers or os.cpu_count() or 1
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.concurrency = concurrency or 2 * self.workers
+        self.timeout = timeout
+        self.max_line = max_line
+        self.pool = None
+        self.server = None
+        self._dispatchers = []
+        self._handlers = set()
+        self.stats = {"requests": 0, "ok": 0, "failed": 0, "timeouts": 0, "bad_requests": 0,
+                      "pool_restarts": 0}
+
+    async def start(self, host="127.0.0.1", port=0, unix_path=None):
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._dispatchers = [asyncio.create_task(self._dispatch())
+                             for _ in range(self.concurrency)]
+        if unix_path:
+            self.server = await asyncio.start_unix_server(
+                self._handle, path=unix_path, limit=self.max_line)
+        else:
+            self.server = await asyncio.start_server(
+                self._handle, host, port, limit=self.max_line)
+        return self.server
+
+    @property
+    def address(self):
+        return self.server.sockets[0].getsockname()
+
+    async def close(self):
+        self.server.close()
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        # drop open connections; their handlers see EOF and finish normally
+        handlers = list(self._handlers)
+        for task, conn in handlers:
+            conn.idle.set()
+            conn.writer.transport.abort()
+        await asyncio.gather(*(task for task, _ in handlers), return_exceptions=True)
+        await self.server.wait_closed()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _handle(self, reader, writer):
+        conn = _Connection(writer)
+        entry = (asyncio.current_task(), conn)
+        self._handlers.add(entry)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    await conn.send([{"id": None, "done": True, "ok": False,
+                                      "stage": "request", "errors": ["request line too long"]}])
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    rid, script = request.get("id"), request["script"]
+                    if not isinstance(script, str):
+                        raise TypeError("script must be a string")
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    self.stats["bad_requests"] += 1
+                    await conn.send([{"id": None, "done": True, "ok": False,
+                                      "stage": "request", "errors": [f"bad request: {e}"]}])
+                    continue
+                conn.pending += 1
+                conn.idle.clear()
+                # blocks while the queue is full: input backpressure
+                await self.queue.put((conn, rid, script))
+            await conn.idle.wait()
+        finally:
+            self._handlers.discard(entry)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    def _replace_pool(self, pool):
+        """Swap in a fresh pool and kill the workers of `pool` (once per pool)."""
+        if pool is not self.pool:
+            return  # another dispatcher already replaced it
+        self.stats["pool_restarts"] += 1
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        # the executor has no public way to stop a running task
+        for process in list((getattr(pool, "_processes", None) or {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False)
+
+    async def _validate(self, script):
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            pool = self.pool
+            future = loop.run_in_executor(pool, validate, script)
+            # the pool's own future must not be cancelled: it is failed when
+            # the pool is replaced, and a cancelled one trips up the executor
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            try:
+                return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+            except asyncio.TimeoutError:
+                self._replace_pool(pool)
+                raise
+            except BrokenProcessPool:
+                # killed after another request's timeout, or a worker crashed
+                self._replace_pool(pool)
+                if attempt:
+                    raise
+
+    async def _dispatch(self):
+        while True:
+            conn, rid, script = await self.queue.get()
+            self.stats["requests"] += 1
+            try:
+                result = await self._validate(script)
+            except asyncio.TimeoutError:
+                self.stats["timeouts"] += 1
+                result = {"ok": False, "stage": "timeout",
+                          "errors": [f"timed out after {self.timeout}s"]}
+            except Exception as e:  # a crashed worker must not kill the dispatcher
+                result = {"ok": False, "stage": "internal", "errors": [repr(e)]}
+
+            commands = result.get("commands", [])
+            messages = [{"id": rid, "command": c} for c in commands]
+            done = {"id": rid, "done": True, "ok": result["ok"], "count": len(commands)}
+            if result["ok"]:
+                self.stats["ok"] += 1
+            else:
+                self.stats["failed"] += 1
+                done.update(stage=result["stage"], errors=result["errors"])
+            messages.append(done)
+            try:
+                await conn.send(messages)
+            except (ConnectionError, OSError):
+                pass  # client went away
+            finally:
+                conn.pending -= 1
+                if not conn.pending:
+                    conn.idle.set()
+                self.queue.task_done()
+
+async def serve(args):
+    server = ValidationServer(workers=args.workers, queue_size=args.queue,
+                              concurrency=args.concurrency, timeout=args.timeout)
+    await server.start(args.host, args.port, args.unix)
+    print(f"Validation server listening on {args.unix or server.address}")
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Script validation server")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    ap.add_argument("--workers", type=int, default=None, help="worker processes")
+    ap.add_argument("--queue", type=int, default=256, help="max queued requests")
+    ap.add_argument("--concurrency", type=int, default=None, help="requests in flight")
+    ap.add_argument("--timeout", type=float, default=5.0, help="per-request seconds")
+    try:
+        asyncio.run(serve(ap.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -13,5 +13,8 @@ class TokenType(Enum):
     IDENTIFIER = auto()
     NUMBER     = auto()
     KEYWORD    = auto()
+    OPERATOR   = auto()
+    LPAREN     = auto()
+    RPAREN     = auto()
     COMMENT    = auto()
     EOF        = auto()
@@ -0,0 +1,97 @@
+# src/vm.py
+
+from functools import partial
+
+if __package__:
+    from .ast_nodes import ASTNode, Command, command_node
+    from .expr_parser import compile_expr
+else:  # run as a script from this folder
+    from ast_nodes import ASTNode, Command, command_node
+    from expr_parser import compile_expr
+
+# opcode i calls the game-state method OPCODES[i]
+OPCODES = ("move", "attack", "block", "use", "cast")
+_OPCODE = {name: i for i, name in enumerate(OPCODES)}
+
+class GameState:
+    """
+    Minimal game state the VM can drive. Any object with the same five
+    methods can be plugged in instead.
+    """
+    __slots__ = ("x", "y", "attacks", "blocks", "items", "spells", "variables")
+
+    STEPS = {"forward": (0, 1), "back": (0, -1), "left": (-1, 0), "right": (1, 0)}
+
+    def __init__(self):
+        self.x = self.y = 0
+        self.attacks = self.blocks = self.items = self.spells = 0
+        # values of the variables used in expressions, e.g. {"speed": 2}
+        self.variables = {}
+
+    def move(self, amount, direction):
+        dx, dy = self.STEPS[direction]
+        self.x += dx * amount
+        self.y += dy * amount
+
+    def attack(self, action, weapon=None):
+        self.attacks += 1
+
+    def block(self, direction=None):
+        self.blocks += 1
+
+    def use(self, item, target):
+        self.items += 1
+
+    def cast(self, spell, target=None):
+        self.spells += 1
+
+    def __repr__(self):
+        return (f"GameState(pos=({self.x}, {self.y}), attacks={self.attacks}, "
+                f"blocks={self.blocks}, items={self.items}, spells={self.spells})")
+
+def compile_script(commands):
+    """
+    Compile parsed commands (dicts from Parser.parse or Command nodes) into
+    flat bytecode: a tuple of (opcode, operands) pairs, independent of any
+    game state.
+    """
+    program = []
+    for cmd in commands:
+        node = cmd if isinstance(cmd, Command) else command_node(cmd)
+        program.append((_OPCODE[node.OP], node.operands()))
+    return tuple(program)
+
+class VM:
+    """Runs compiled programs against a pluggable game-state object."""
+
+    def __init__(self, state=None):
+        self.state = GameState() if state is None else state
+
+    def bind(self, program):
+        """
+        Pre-bind every instruction to its handler: a list of closures.
+        Expression operands are compiled once and evaluated on every call
+        against the state's `variables`.
+        """
+        handlers = [getattr(self.state, name) for name in OPCODES]
+        env = getattr(self.state, "variables", {})
+        bound = []
+        for op, args in program:
+            if any(isinstance(a, ASTNode) for a in args):
+                bound.append(self._bind_dynamic(handlers[op], args, env))
+            else:
+                bound.append(partial(handlers[op], *args))
+        return bound
+
+    @staticmethod
+    def _bind_dynamic(handler, args, env):
+        getters = [compile_expr(a) if isinstance(a, ASTNode) else (lambda _, a=a: a)
+                   for a in args]
+        return lambda: handler(*[get(env) for get in getters])
+
+    def run(self, program, repeat=1):
+        bound = self.bind(program)
+        for _ in range(repeat):
+            for step in bound:
+                step()
+        return self.state
@@ -1,4 +1,14 @@
+import functools
+import os
 import random
+import sys
+
+if __package__:
+    from ..automata import Matcher, determinize, regular_nfa, scan_file
+else:  # run as a script: make the repository root (and lfa) importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from lfa.automata import Matcher, determinize, regular_nfa, scan_file
+
 
 class Grammar:
     def __init__(self):
@@ -38,37 +48,35 @@ class Grammar:
                 results.add(candidate)
         return list(results)
 
+    def fingerprint(self):
+        """Canonical, hashable form of the grammar (order-independent)."""
+        return (
+            self.start_symbol,
+            tuple(sorted(self.non_terminals)),
+            tuple(sorted(self.terminals)),
+            tuple((nt, tuple(sorted(set(ps)))) for nt, ps in sorted(self.productions.items())),
+        )
+
     def to_finite_automaton(self):
         """
-        Converts the grammar into a Finite Automaton.
-        Each non-terminal becomes a state (named as 'q_<non-terminal>'),
-        with an extra start state 'q_start' and an accept state 'q_accept'.
+        Converts the grammar into a deterministic Finite Automaton.
+        Works for any right- or left-linear grammar (see _compile); the
+        result is memoized on the grammar's fingerprint and shared between
+        calls, so it must not be modified.
         """
-        # Define states
-        states = {f'q_{nt}' for nt in self.non_terminals} | {'q_start', 'q_accept'}
-        transitions = {state: {} for state in states}
-
-        # Build transitions from non-terminal states.
-        for nt in self.non_terminals:
-            state = f'q_{nt}'
-            for prod in self.productions.get(nt, []):
-                symbol = prod[0]
-                if len(prod) > 1 and prod[1] in self.non_terminals:
-                    next_state = f'q_{prod[1]}'
-                else:
-                    next_state = 'q_accept'
-                transitions[state][symbol] = next_state
-
-        # Add transitions from the dedicated start state.
-        for prod in self.productions[self.start_symbol]:
-            symbol = prod[0]
-            if len(prod) > 1 and prod[1] in self.non_terminals:
-                next_state = f'q_{prod[1]}'
-            else:
-                next_state = 'q_accept'
-            transitions['q_start'][symbol] = next_state
-
-        return FiniteAutomaton(states, self.terminals, transitions, 'q_start', {'q_accept'})
+        return _compile(self.fingerprint())
+
+# ───────────── Regular grammar → DFA ─────────────
+@functools.lru_cache(maxsize=256)
+def _compile(fingerprint):
+    """
+    DFA of a right- or left-linear grammar given as a fingerprint: the NFA
+    built by lfa.automata.regular_nfa, determinized (subset states are
+    named by joining their members with '+').
+    """
+    _, transitions, initial, accept_states = regular_nfa(fingerprint)
+    states, dfa, start, accepting = determinize(transitions, initial, accept_states)
+    return FiniteAutomaton(states, set(fingerprint[2]), dfa, start, accepting)
 
 class FiniteAutomaton:
     def __init__(self, states, alphabet, transitions, start_state, accept_states):
@@ -77,6 +85,7 @@ class FiniteAutomaton:
         self.transitions = transitions
         self.start_state = start_state
         self.accept_states = accept_states
+        self._tables = None  # Matcher tables, see matcher()
 
     def accepts(self, input_string):
         """
@@ -92,6 +101,46 @@ class FiniteAutomaton:
             current_state = self.transitions[current_state][char]
         return current_state in self.accept_states
 
+    def matcher(self):
+        """
+        Push-mode matcher for chunked or streamed input (lfa.automata.Matcher).
+        Its tables are built on first use and shared by later matchers, so
+        transitions should not be edited after that.
+        """
+        if self._tables is None:
+            moves = {state: {symbol: {nxt} for symbol, nxt in row.items()}
+                     for state, row in self.transitions.items()}
+            self._tables = Matcher.tables(moves, self.accept_states)
+        return Matcher(self, self._tables)
+
+    def byte_table(self):
+        """
+        Dense byte-level transition table for match_file. States are numbered
+        from 0 (the start state); the extra last row is the dead state.
+        Returns (table, accepting) with table[s][b] the next state on byte b.
+        """
+        order = [self.start_state] + sorted(s for s in self.states if s != self.start_state)
+        index = {s: i for i, s in enumerate(order)}
+        dead = len(order)
+        table = [[dead] * 256 for _ in range(dead + 1)]
+        for state, moves in self.transitions.items():
+            for symbol, next_state in moves.items():
+                data = symbol.encode()
+                if len(data) != 1:
+                    raise ValueError(f"Symbol {symbol!r} is not a single byte")
+                table[index[state]][data[0]] = index[next_state]
+        accepting = [s in self.accept_states for s in order] + [False]
+        return table, accepting
+
+    def match_file(self, path, offsets=False, engine="auto"):
+        """
+        Run the automaton over every line of a newline-delimited file without
+        reading it into strings (see lfa.automata.scan_file for the result
+        and the engines).
+        """
+        table, accepting = self.byte_table()
+        return scan_file(table, accepting, path, offsets, engine)
+
 def main():
     grammar = Grammar()
 
@@ -1,4 +1,14 @@
+import functools
+import os
 import random
+import sys
+
+if __package__:
+    from ..automata import Matcher, linearity, regular_nfa
+else:  # run as a script: make the repository root (and lfa) importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from lfa.automata import Matcher, linearity, regular_nfa
+
 
 class Grammar:
     def __init__(self):
@@ -35,66 +45,44 @@ class Grammar:
             results.append((derived_string, derivation.strip()))
         return results
 
+    def fingerprint(self):
+        """Canonical, hashable form of the grammar (order-independent)."""
+        return (
+            self.start,
+            tuple(sorted(self.VN)),
+            tuple(sorted(self.VT)),
+            tuple((A, tuple(sorted(set(self.P[A])))) for A in sorted(self.P)),
+        )
+
     def to_finite_automaton(self):
-        # Map nonterminals S, B, D to states: qS, qB, qD.
-        # Introduce a final state qF for terminal productions.
-        states = {'qS', 'qB', 'qD', 'qF'}
-        transitions = {
-            # S → aB
-            'qS': {
-                'a': {'qB'}
-            },
-            # B → aD, B → bB, B → cS
-            'qB': {
-                'a': {'qD'},
-                'b': {'qB'},
-                'c': {'qS'}
-            },
-            # D → aD, D → bS, D → c (c leads to final state)
-            'qD': {
-                'a': {'qD'},
-                'b': {'qS'},
-                'c': {'qF'}
-            }
-        }
-        return FiniteAutomaton(states, self.VT, transitions, 'qS', {'qF'})
+        """
+        Compile the grammar to an NFA (see _compile). The result is memoized
+        on the grammar's fingerprint, so converting the same grammar again is
+        a cache lookup; the returned automaton is shared and must not be
+        modified.
+        """
+        return _compile(self.fingerprint())
 
     def classify_grammar(self):
-        is_type_3 = True
-        is_type_2 = True
-        is_type_1 = True
-
-        for non_terminal, productions in self.P.items():
-            for production in productions:
-                # Check for Type 3 (Regular Grammar):
-                # Valid forms: A → a or A → aB or A → Ba (depending on right/left linear)
-                if len(production) == 1 and production[0] in self.VT:
-                    continue
-                elif len(production) == 2 and production[0] in self.VT and production[1] in self.VN:
-                    continue
-                elif len(production) == 2 and production[0] in self.VN and production[1] in self.VT:
-                    continue
-                else:
-                    is_type_3 = False
-
-                # Check for Type 2 (Context-Free Grammar)
-                if len(non_terminal) != 1 or non_terminal not in self.VN:
-                    is_type_2 = False
-
-                # Check for Type 1 (Context-Sensitive Grammar)
-                if len(production) < len(non_terminal):
-                    is_type_1 = False
-
-        if is_type_3:
+        right, left, type2, type1 = linearity(self.VN, self.P, self.start)
+        if right or left:
             return "Type 3 (Regular)"
-        elif is_type_2:
+        elif type2:
             return "Type 2 (Context-Free)"
-        elif is_type_1:
+        elif type1:
             return "Type 1 (Context-Sensitive)"
         else:
             return "Type 0 (Unrestricted)"
 
 
+# ───────────── Regular grammar → NFA ─────────────
+@functools.lru_cache(maxsize=256)
+def _compile(fingerprint):
+    """NFA of a right- or left-linear grammar (see lfa.automata.regular_nfa)."""
+    states, transitions, initial, accept_states = regular_nfa(fingerprint)
+    return FiniteAutomaton(states, set(fingerprint[2]), transitions, initial, accept_states)
+
+
 class FiniteAutomaton:
     def __init__(self, states, alphabet, transitions, start_state, accept_states):
         self.states = states
@@ -102,6 +90,7 @@ class FiniteAutomaton:
         self.transitions = transitions
         self.start_state = start_state
         self.accept_states = accept_states
+        self._tables = None  # Matcher tables, see matcher()
 
     def accepts(self, input_string):
         current_states = {self.start_state}
@@ -115,6 +104,16 @@ class FiniteAutomaton:
             current_states = next_states
         return bool(current_states & self.accept_states)
 
+    def matcher(self):
+        """
+        Push-mode matcher for chunked or streamed input (lfa.automata.Matcher).
+        Its tables are built on first use and shared by later matchers, so
+        transitions should not be edited after that.
+        """
+        if self._tables is None:
+            self._tables = Matcher.tables(self.transitions, self.accept_states)
+        return Matcher(self, self._tables)
+
 
 if __name__ == "__main__":
     grammar = Grammar()
@@ -1,4 +1,12 @@
-import graphviz
+import os
+import sys
+
+if __package__:
+    from ..automata import Matcher, scan_file
+else:  # run as a script: make the repository root (and lfa) importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from lfa.automata import Matcher, scan_file
+
 
 class FiniteAutomaton:
     def __init__(self, states, alphabet, transitions, start_state, final_states):
@@ -7,6 +15,7 @@ class FiniteAutomaton:
         self.transitions = transitions
         self.start_state = start_state
         self.final_states = final_states
+        self._tables = None  # Matcher tables, see matcher()
 
     def is_deterministic(self):
         for state in self.states:
@@ -26,6 +35,27 @@ class FiniteAutomaton:
                     destinations.append(dest_states)
         return destinations
 
+    def accepts(self, input_string):
+        matcher = self.matcher()
+        matcher.feed(input_string)
+        return matcher.is_accepting()
+
+    def matcher(self):
+        """
+        Push-mode matcher for chunked or streamed input (lfa.automata.Matcher).
+        Its tables are built on first use and shared by later matchers, so
+        transitions should not be edited after that.
+        """
+        if self._tables is None:
+            # indexed by state, instead of scanning every transition per
+            # step as get_transitions does
+            moves = {}
+            for (state, symbol), dest in self.transitions.items():
+                dests = dest if isinstance(dest, list) else [dest]
+                moves.setdefault(state, {}).setdefault(symbol, set()).update(dests)
+            self._tables = Matcher.tables(moves, self.final_states)
+        return Matcher(self, self._tables)
+
     def to_regular_grammar(self):
         grammar = {}
         for (state, symbol), destinations in self.transitions.items():
@@ -91,7 +121,39 @@ class FiniteAutomaton:
             final_states=[state_map[state] for state in dfa_final_states]
         )
 
+    def byte_table(self):
+        """
+        Dense byte-level transition table of the DFA (call to_dfa first for
+        an NFA). States are numbered from 0 (the start state); the extra last
+        row is the dead state. Returns (table, accepting) with table[s][b] the
+        next state on byte b and accepting[s] a bool.
+        """
+        order = [self.start_state] + [s for s in self.states if s != self.start_state]
+        index = {s: i for i, s in enumerate(order)}
+        dead = len(order)
+        table = [[dead] * 256 for _ in range(dead + 1)]
+        for (state, symbol), dest in self.transitions.items():
+            dests = dest if isinstance(dest, list) else [dest]
+            data = symbol.encode()
+            if len(dests) != 1 or len(data) != 1:
+                raise ValueError(f"Need a DFA over single-byte symbols, got δ({state}, {symbol}) = {dest}")
+            table[index[state]][data[0]] = index[dests[0]]
+        accepting = [s in self.final_states for s in order] + [False]
+        return table, accepting
+
+    def match_file(self, path, offsets=False, engine="auto"):
+        """
+        Run the automaton over every line of a newline-delimited file without
+        reading it into strings (see lfa.automata.scan_file for the result
+        and the engines). An NFA is determinized first.
+        """
+        dfa = self if self.is_deterministic() else self.to_dfa()
+        table, accepting = dfa.byte_table()
+        return scan_file(table, accepting, path, offsets, engine)
+
     def visualize(self):
+        import graphviz  # optional, only needed for drawing
+
         dot = graphviz.Digraph(comment='Finite Automaton')
         for state in self.states:
             if state in self.final_states:
@@ -108,47 +170,55 @@ class FiniteAutomaton:
                 dot.edge(state, destinations, label=symbol)
         return dot
 
-# Variant 13 definition:
-states = ['q0', 'q1', 'q2', 'q3']
-alphabet = ['a', 'b']
-transitions = {
-    ('q0', 'a'): 'q0',
-    ('q0', 'b'): 'q1',
-    ('q1', 'a'): ['q1', 'q2'],  # nondeterministic: two transitions on 'a'
-    ('q1', 'b'): 'q3',
-    ('q2', 'a'): 'q2',
-    ('q2', 'b'): 'q3'
-}
-start_state = 'q0'
-final_states = ['q3']
-
-fa = FiniteAutomaton(states, alphabet, transitions, start_state, final_states)
-
-grammar = fa.to_regular_grammar()
-print("Regular Grammar:")
-for non_terminal, productions in grammar.items():
-    for production in productions:
-        print(f"{non_terminal} → {production}")
-
-is_dfa = fa.is_deterministic()
-print(f"\nIs the FA deterministic? {'Yes' if is_dfa else 'No'}")
-if not is_dfa:
-    print("Reason: The state q1 has two transitions on the symbol 'a' (to both q1 and q2)")
-
-if not is_dfa:
-    print("\nConverting NDFA to DFA...")
-    dfa = fa.to_dfa()
-    print("DFA states:", dfa.states)
-    print("DFA transitions:")
-    for (state, symbol), dest in dfa.transitions.items():
-        print(f"δ({state}, {symbol}) = {dest}")
-    print("DFA final states:", dfa.final_states)
-
-fa_visual = fa.visualize()
-fa_visual.render('finite_automaton_variant13', format='png', cleanup=True)
-print("\nFA visualization saved as 'finite_automaton_variant13.png'")
-
-if not is_dfa:
-    dfa_visual = dfa.visualize()
-    dfa_visual.render('deterministic_finite_automaton_variant13', format='png', cleanup=True)
-    print("DFA visualization saved as 'deterministic_finite_automaton_variant13.png'")
+def main():
+    # Variant 13 definition:
+    states = ['q0', 'q1', 'q2', 'q3']
+    alphabet = ['a', 'b']
+    transitions = {
+        ('q0', 'a'): 'q0',
+        ('q0', 'b'): 'q1',
+        ('q1', 'a'): ['q1', 'q2'],  # nondeterministic: two transitions on 'a'
+        ('q1', 'b'): 'q3',
+        ('q2', 'a'): 'q2',
+        ('q2', 'b'): 'q3'
+    }
+    start_state = 'q0'
+    final_states = ['q3']
+
+    fa = FiniteAutomaton(states, alphabet, transitions, start_state, final_states)
+
+    grammar = fa.to_regular_grammar()
+    print("Regular Grammar:")
+    for non_terminal, productions in grammar.items():
+        for production in productions:
+            print(f"{non_terminal} → {production}")
+
+    is_dfa = fa.is_deterministic()
+    print(f"\nIs the FA deterministic? {'Yes' if is_dfa else 'No'}")
+    if not is_dfa:
+        print("Reason: The state q1 has two transitions on the symbol 'a' (to both q1 and q2)")
+
+    if not is_dfa:
+        print("\nConverting NDFA to DFA...")
+        dfa = fa.to_dfa()
+        print("DFA states:", dfa.states)
+        print("DFA transitions:")
+        for (state, symbol), dest in dfa.transitions.items():
+            print(f"δ({state}, {symbol}) = {dest}")
+        print("DFA final states:", dfa.final_states)
+
+    try:
+        fa_visual = fa.visualize()
+    except ImportError:
+        print("\ngraphviz is not installed, skipping the PNG rendering")
+        return
+    fa_visual.render('finite_automaton_variant13', format='png', cleanup=True)
+    print("\nFA visualization saved as 'finite_automaton_variant13.png'")
+
+    if not is_dfa:
+        dfa_visual = dfa.visualize()
+        dfa_visual.render('deterministic_finite_automaton_variant13', format='png', cleanup=True)
+        print("DFA visualization saved as 'deterministic_finite_automaton_variant13.png'")
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,7 @@
-from lexer import Lexer
+if __package__:
+    from .lexer import Lexer
+else:  # run as a script from this folder
+    from lexer import Lexer
 
 test_cases = [
     ("Valid MOVE & direction", "MOVE 10 forward"),
@@ -1,11 +1,15 @@
+import gzip
+import io
 import random
 import re
+import time
 
 
 class CombinationGenerator:
     def __init__(self, max_repetitions=5):
         self.max_repetitions = max_repetitions
         self.steps = []
+        self._compiled = {}
 
     def _normalize_regex(self, regex_str):
         """
@@ -25,7 +29,7 @@ class CombinationGenerator:
 
         return regex_str
 
-    def tokenize(self, regex_str):
+    def tokenize(self, regex_str, log=True):
         """
         Convert the normalized 'regex' string into tokens.
         Each token is either:
@@ -33,8 +37,10 @@ class CombinationGenerator:
           - a letter with a repetition marker: x*, x+, x?, x3
           - a multi-digit literal: e.g. '36'
           - a single character literal
+        The steps are recorded in self.steps unless 'log' is False.
         """
-        self.steps.append(f"1. Tokenizing: '{regex_str}'")
+        if log:
+            self.steps.append(f"1. Tokenizing: '{regex_str}'")
 
         patterns = [
             # (a|b)(?:*|+|?|number)?
@@ -70,14 +76,16 @@ class CombinationGenerator:
                     tokens.append((regex_str[i], 'literal'))
                     i += 1
 
-        token_summary = ", ".join(f"'{t[0]}'" for t in tokens)
-        self.steps.append(f"2. Tokens identified: {token_summary}")
+        if log:
+            token_summary = ", ".join(f"'{t[0]}'" for t in tokens)
+            self.steps.append(f"2. Tokens identified: {token_summary}")
         return tokens
 
-    def parse_group(self, group_token):
+    def parse_group(self, group_token, log=True):
         """
         Parse a group of the form '(a|b)', possibly with a repetition marker.
         e.g. (a|b)*, (3|4)5, (UV|w|(x))*, etc.
+        The step is recorded in self.steps unless 'log' is False.
         """
         match = re.match(r'\(([^()]+)\)([*+?]|\d+)?', group_token)
         if not match:
@@ -107,7 +115,8 @@ class CombinationGenerator:
             possible_counts = [n]
             rep_description = f"exactly {n}"
 
-        self.steps.append(f"- Group '{group_token}': alternatives={alternatives}, repetition={rep_description}")
+        if log:
+            self.steps.append(f"- Group '{group_token}': alternatives={alternatives}, repetition={rep_description}")
         return alternatives, possible_counts
 
     def generate_combinations(self, regex_str, count=10, seed=None):
@@ -185,10 +194,302 @@ class CombinationGenerator:
 
         return results
 
+    def _token_options(self, token, ttype):
+        """
+        List every distinct string a single token can produce, in a fixed order.
+        Mirrors the choices made by generate_combinations for the same token.
+        """
+        if ttype == 'zero_or_more':
+            options = [token[0] * r for r in range(self.max_repetitions + 1)]
+        elif ttype == 'one_or_more':
+            options = [token[0] * r for r in range(1, self.max_repetitions + 1)]
+        elif ttype == 'optional':
+            options = ['', token[0]]
+        elif ttype == 'repeat':
+            m = re.match(r'([A-Za-z0-9])(\d+)', token)
+            options = [m.group(1) * int(m.group(2))] if m else [token]
+        elif ttype == 'group':
+            alts, counts = self.parse_group(token, log=False)
+            options = []
+            for n in counts:
+                if n == 0:
+                    options.append("")
+                else:
+                    options.extend(alt * n for alt in alts)
+        else:
+            options = [token]
+        # drop duplicates such as (a|aa)* producing 'aa' twice
+        return list(dict.fromkeys(options))
+
+    def _compile(self, regex_str):
+        """
+        Normalize and tokenize 'regex_str' once and build the _Language used by
+        count/enumerate/unrank. Results are memoized per pattern; self.steps
+        keeps the log of the last generate_combinations call.
+        """
+        key = (regex_str, self.max_repetitions)
+        if key not in self._compiled:
+            tokens = self.tokenize(self._normalize_regex(regex_str), log=False)
+            self._compiled[key] = _Language([self._token_options(t, tt) for t, tt in tokens])
+        return self._compiled[key]
+
+    def count(self, regex_str):
+        """
+        Return the number of distinct strings 'regex_str' can produce (a Python
+        big integer). Strings reachable through several token choices, such as
+        'aa' in 'a*a*', are counted once.
+        """
+        return self._compile(regex_str).count()
+
+    def enumerate(self, regex_str):
+        """
+        Lazily yield every distinct string of 'regex_str' in rank order
+        (lexicographic, a string before its extensions), so that the i-th
+        yielded value equals unrank(regex_str, i).
+        """
+        return self._compile(regex_str).strings()
+
+    def unrank(self, regex_str, index):
+        """
+        Return the string with rank 'index' (0 <= index < count(regex_str)).
+        Walks the automaton once, skipping whole subtrees by their string
+        counts: O(length * alphabet) big-integer operations.
+        """
+        language = self._compile(regex_str)
+        total = language.count()
+        if not 0 <= index < total:
+            raise IndexError(f"rank {index} out of range for {total} strings")
+        return language.unrank(index)
+
+    def _samplers(self, regex_str):
+        """
+        Precompute, per token, the data generate_combinations draws from, so
+        bulk generation can skip re-parsing groups and logging steps.
+        """
+        tokens = self.tokenize(self._normalize_regex(regex_str), log=False)
+        samplers = []
+        for token, ttype in tokens:
+            if ttype == 'zero_or_more':
+                samplers.append(('range', token[0], 0))
+            elif ttype == 'one_or_more':
+                samplers.append(('range', token[0], 1))
+            elif ttype == 'optional':
+                samplers.append(('optional', token[0], None))
+            elif ttype == 'group':
+                alts, counts = self.parse_group(token, log=False)
+                samplers.append(('group', alts, list(counts)))
+            else:
+                # literals and fixed repeats never consume randomness
+                samplers.append(('fixed', self._token_options(token, ttype)[0], None))
+        return samplers
+
+    def _open_output(self, path_or_fileobj, compression):
+        """
+        Return (stream, raw, owned): 'stream' is what gets written to (possibly a
+        compressor around 'raw'), 'owned' tells whether we opened 'raw' ourselves.
+        """
+        if compression not in (None, 'gzip', 'zstd'):
+            raise ValueError(f"unsupported compression '{compression}'")
+
+        owned = not hasattr(path_or_fileobj, 'write')
+        if owned:
+            raw = open(path_or_fileobj, 'wb')
+        elif isinstance(path_or_fileobj, io.TextIOBase):
+            # e.g. sys.stdout: write bytes to the underlying buffer
+            raw = getattr(path_or_fileobj, 'buffer', None)
+            if raw is None:  # e.g. io.StringIO
+                raise TypeError(
+                    f"generate_to writes bytes: pass a path, a binary file object or a "
+                    f"text stream with a .buffer, not {type(path_or_fileobj).__name__}")
+            path_or_fileobj.flush()
+        else:
+            raw = path_or_fileobj
+
+        if compression == 'gzip':
+            return gzip.GzipFile(fileobj=raw, mode='wb'), raw, owned
+        if compression == 'zstd':
+            try:
+                import zstandard
+            except ImportError as e:
+                raise ImportError("zstd output requires the 'zstandard' package") from e
+            return zstandard.ZstdCompressor().stream_writer(raw, closefd=False), raw, owned
+        return raw, raw, owned
+
+    def generate_to(self, regex_str, path_or_fileobj, count, seed=None,
+                    compression=None, buffer_size=1 << 20, report=True):
+        """
+        Stream 'count' random strings matching 'regex_str' to a path or binary
+        file object, one per line, in constant memory.
+          - Draws are identical to generate_combinations for the same seed.
+          - Output is collected in one reusable bytearray of ~'buffer_size'
+            bytes and written in bulk.
+          - compression may be None, 'gzip' or 'zstd' (needs 'zstandard').
+        Returns a dict with the line count, bytes written, elapsed seconds and
+        throughput, which is also printed when 'report' is set.
+        """
+        if seed is not None:
+            random.seed(seed)
+        samplers = self._samplers(regex_str)
+        randint, choice = random.randint, random.choice
+        max_rep = self.max_repetitions
+
+        stream, raw, owned = self._open_output(path_or_fileobj, compression)
+        buf = bytearray()
+        written = 0
+        start = time.perf_counter()
+        try:
+            for _ in range(count):
+                combo = []
+                for kind, a, b in samplers:
+                    if kind == 'fixed':
+                        combo.append(a)
+                    elif kind == 'range':
+                        combo.append(a * randint(b, max_rep))
+                    elif kind == 'optional':
+                        if randint(0, 1) == 1:
+                            combo.append(a)
+                    else:
+                        chosen_count = choice(b)
+                        if chosen_count:
+                            combo.append(choice(a) * chosen_count)
+                combo.append('\n')
+                buf += ''.join(combo).encode()
+                if len(buf) >= buffer_size:
+                    stream.write(buf)
+                    written += len(buf)
+                    buf.clear()
+            if buf:
+                stream.write(buf)
+                written += len(buf)
+                buf.clear()
+        finally:
+            if stream is not raw:
+                stream.close()  # finishes the compressed frame, leaves raw open
+            if owned:
+                raw.close()
+            else:
+                raw.flush()
+
+        elapsed = time.perf_counter() - start
+        stats = {
+            'lines': count,
+            'bytes': written,
+            'seconds': elapsed,
+            'lines_per_sec': count / elapsed if elapsed else float('inf'),
+            'mb_per_sec': written / elapsed / 1e6 if elapsed else float('inf'),
+        }
+        if report:
+            print(f"Wrote {count} lines ({written / 1e6:.1f} MB uncompressed) "
+                  f"in {elapsed:.2f}s: {stats['lines_per_sec']:.0f} lines/s, "
+                  f"{stats['mb_per_sec']:.1f} MB/s")
+        return stats
+
     def get_steps(self):
         return self.steps
 
 
+class _Language:
+    """
+    The strings of a concatenation of finite option lists, as a DFA built
+    lazily by subset construction. Different choices can spell the same
+    string ('a*a*' reaches 'aa' three ways), so the choices themselves
+    over-count; the DFA has exactly one path per distinct string.
+
+    Each option list becomes a trie; NFA states are (token, trie node) pairs
+    and a final trie node continues at the root of the next token, with
+    token len(tries) as the end. Every move goes deeper into a trie or on to
+    a later token, so the DFA is acyclic and string counts are finite.
+    """
+
+    def __init__(self, option_lists):
+        self.tries = []
+        for options in option_lists:
+            children, final = [{}], [False]
+            for option in options:
+                node = 0
+                for ch in option:
+                    if ch not in children[node]:
+                        children[node][ch] = len(children)
+                        children.append({})
+                        final.append(False)
+                    node = children[node][ch]
+                final[node] = True
+            self.tries.append((children, final))
+        self.end = (len(self.tries), 0)
+        self.start = self._closure({(0, 0)})
+        self._moves = {}
+        self._counts = {}
+
+    def _closure(self, states):
+        todo, seen = list(states), set(states)
+        while todo:
+            i, node = todo.pop()
+            if i < len(self.tries) and self.tries[i][1][node] and (i + 1, 0) not in seen:
+                seen.add((i + 1, 0))
+                todo.append((i + 1, 0))
+        return frozenset(seen)
+
+    def accepting(self, state):
+        return self.end in state
+
+    def moves(self, state):
+        """(symbol, next state) pairs of 'state', sorted by symbol."""
+        if state not in self._moves:
+            step = {}
+            for i, node in state:
+                if i < len(self.tries):
+                    for ch, child in self.tries[i][0][node].items():
+                        step.setdefault(ch, set()).add((i, child))
+            self._moves[state] = [(ch, self._closure(step[ch])) for ch in sorted(step)]
+        return self._moves[state]
+
+    def count(self, state=None):
+        """Number of strings accepted from 'state' (the start by default)."""
+        state = self.start if state is None else state
+        counts = self._counts
+        stack = [state]
+        while stack:
+            top = stack[-1]
+            if top in counts:
+                stack.pop()
+                continue
+            # iterative post order: strings can be longer than the recursion limit
+            missing = [nxt for _, nxt in self.moves(top) if nxt not in counts]
+            if missing:
+                stack += missing
+                continue
+            stack.pop()
+            counts[top] = self.accepting(top) + sum(counts[nxt] for _, nxt in self.moves(top))
+        return counts[state]
+
+    def strings(self):
+        """Yield the accepted strings in lexicographic order."""
+        stack = [(self.start, "")]
+        while stack:
+            state, prefix = stack.pop()
+            if self.accepting(state):
+                yield prefix
+            for ch, nxt in reversed(self.moves(state)):
+                if self.count(nxt):
+                    stack.append((nxt, prefix + ch))
+
+    def unrank(self, index):
+        """The string with lexicographic rank 'index' (0 <= index < count())."""
+        state, out = self.start, []
+        while True:
+            if self.accepting(state):
+                if index == 0:
+                    return ''.join(out)
+                index -= 1
+            for ch, nxt in self.moves(state):
+                n = self.count(nxt)
+                if index < n:
+                    out.append(ch)
+                    state = nxt
+                    break
+                index -= n
+
+
 if __name__ == "__main__":
 
     # with spaces between each piece:
@@ -208,3 +509,8 @@ if __name__ == "__main__":
     print("\nDETAIL STEPS:")
     for st in gen.get_steps():
         print(st)
+
+    total = gen.count(variant_1)
+    print(f"\nLANGUAGE SIZE: {total}")
+    print("  first:", gen.unrank(variant_1, 0))
+    print("  last: ", gen.unrank(variant_1, total - 1))
@@ -0,0 +1,315 @@
+"""
+Benchmark suite for every engine in the repository.
+
+    python bench.py                      run everything, write bench_results.json
+    python bench.py --quick              smaller sizes (a few seconds)
+    python bench.py --save-baseline      also store the results as the baseline
+    python bench.py --only lexer         run workloads whose name contains 'lexer'
+    python bench.py --metrics prometheus also collect hot-path counters (metrics.py)
+
+Each workload is timed at several input sizes (best of --repeat runs, setup
+excluded). If a baseline file exists, every result is compared with it and
+the run exits with status 1 when something got slower by more than
+--threshold (default 25%). Needs nothing beyond the standard library.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+import metrics
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+INSTRUMENT = False  # set by --metrics: attach metrics.py probes to loaded modules
+
+# ───────────── Loading lab modules ─────────────
+def load(folder, filename):
+    """
+    Import `folder/filename` by path as a fresh top-level module
+    `bench_<folder>_<file>`, so the lab takes the script branch of its
+    imports. The labs use sibling imports (`from tokens import ...`) with
+    clashing names, so the folder is put on sys.path only for the import and
+    the sibling modules loaded from it are forgotten afterwards; the shared
+    lfa modules (lfa.automata, lfa.lexing) stay imported. Module-level demo
+    output is swallowed, and with --metrics the module is instrumented.
+    """
+    directory = os.path.join(ROOT, folder)
+    name = f"bench_{folder}_{os.path.splitext(filename)[0]}".replace(".", "_")
+    spec = importlib.util.spec_from_file_location(name, os.path.join(directory, filename))
+    module = importlib.util.module_from_spec(spec)
+    before = set(sys.modules)
+    sys.path.insert(0, directory)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(directory)
+        for mod in set(sys.modules) - before:
+            if os.path.dirname(getattr(sys.modules[mod], "__file__", None) or "") == directory:
+                del sys.modules[mod]
+    if INSTRUMENT:
+        metrics.instrument(module)
+    return module
+
+# ───────────── Workload registry ─────────────
+WORKLOADS = []
+
+def workload(name, sizes, quick):
+    """
+    Register `fn(size) -> callable`. The returned callable is what gets
+    timed; if it returns a dict of {part: seconds}, each part is recorded
+    as well (used for the per-stage CNF timings).
+    """
+    def register(fn):
+        WORKLOADS.append((name, sizes, quick, fn))
+        return fn
+    return register
+
+def command_script(nbytes, lines, seed=0):
+    rnd = random.Random(seed)
+    out, size = [], 0
+    while size < nbytes:
+        line = rnd.choice(lines)
+        out.append(line)
+        size += len(line) + 1
+    return "\n".join(out)
+
+SCRIPT_LINES = [
+    "MOVE 10 forward",
+    "ATTACK slash with sword",
+    "BLOCK left",
+    "USE potion on self",
+    "CAST fireball on enemy",
+    "# comment line",
+]
+
+# ───────────── LAB1 / LAB2 Lab1.1: grammar + automaton ─────────────
+@workload("lab1.generate", sizes=(200, 1000, 3000), quick=(100, 500))
+def lab1_generate(n):
+    grammar = load("LAB1", "main.py").Grammar()
+    return lambda: grammar.generate_valid_strings(n)
+
+@workload("lab1.accepts", sizes=(10_000, 100_000, 1_000_000), quick=(10_000, 100_000))
+def lab1_accepts(n):
+    fa = load("LAB1", "main.py").Grammar().to_finite_automaton()
+    word = "a" + "b" * (n - 3) + "ac"   # S → aB, B → bB…, B → aD, D → c
+    return lambda: fa.accepts(word)
+
+@workload("lab1_1.generate", sizes=(1000, 10_000, 100_000), quick=(1000, 10_000))
+def lab11_generate(n):
+    grammar = load("LAB2", "Lab1.1.py").Grammar()
+    return lambda: grammar.generate_strings(n, max_depth=10)
+
+@workload("lab1_1.accepts", sizes=(10_000, 100_000, 1_000_000), quick=(10_000, 100_000))
+def lab11_accepts(n):
+    fa = load("LAB2", "Lab1.1.py").Grammar().to_finite_automaton()
+    word = "a" + "b" * (n - 3) + "ac"
+    return lambda: fa.accepts(word)
+
+# ───────────── LAB2 Lab2: NFA → DFA ─────────────
+def random_nfa(module, n, seed=0, nondeterministic=0.25):
+    """n states over {a, b}; that fraction of the moves have two targets."""
+    rnd = random.Random(seed)
+    states = [f"q{i}" for i in range(n)]
+    transitions = {}
+    for s in states:
+        for sym in "ab":
+            dests = rnd.sample(states, 2 if rnd.random() < nondeterministic else 1)
+            transitions[(s, sym)] = dests if len(dests) > 1 else dests[0]
+    finals = rnd.sample(states, max(1, n // 4))
+    return module.FiniteAutomaton(states, ["a", "b"], transitions, "q0", finals)
+
+@workload("lab2.is_deterministic", sizes=(50, 200, 800), quick=(50, 200))
+def lab2_is_deterministic(n):
+    # deterministic, so the check scans every state instead of stopping early
+    fa = random_nfa(load("LAB2", "Lab2.py"), n, nondeterministic=0)
+    return fa.is_deterministic
+
+@workload("lab2.to_dfa", sizes=(8, 16, 24), quick=(8, 16))
+def lab2_to_dfa(n):
+    fa = random_nfa(load("LAB2", "Lab2.py"), n)
+    return fa.to_dfa
+
+# ───────────── Lexers (LAB3, 6_ParserASTBuild) ─────────────
+@workload("lab3.lexer", sizes=(256 << 10, 1 << 20, 4 << 20), quick=(64 << 10, 256 << 10))
+def lab3_lexer(nbytes):
+    Lexer = load("LAB3", "lexer.py").Lexer
+    script = command_script(nbytes, SCRIPT_LINES)
+    return lambda: Lexer(script).tokenize()
+
+@workload("parser6.lexer", sizes=(256 << 10, 1 << 20, 4 << 20), quick=(64 << 10, 256 << 10))
+def parser6_lexer(nbytes):
+    Lexer = load("6_ParserASTBuild", "lexer.py").Lexer
+    script = command_script(nbytes, SCRIPT_LINES + ["MOVE 2 * (x + 1) back"])
+    return lambda: Lexer(script).tokenize()
+
+@workload("parser6.lexer.threads", sizes=(1, 2, 4), quick=(1, 2))
+def parser6_lexer_threads(threads):
+    """8 scripts of 256 KiB lexed by `threads` workers sharing one LexerSpec."""
+    from concurrent.futures import ThreadPoolExecutor
+    spec = load("6_ParserASTBuild", "lexer.py").SPEC
+    scripts = [command_script(256 << 10, SCRIPT_LINES, seed) for seed in range(8)]
+
+    def run():
+        with ThreadPoolExecutor(threads) as pool:
+            list(pool.map(spec.tokenize, scripts))
+    return run
+
+# ───────────── LAB4: CombinationGenerator ─────────────
+REGEX = "M?N2(O|P)3Q*R+"
+
+@workload("lab4.generate_combinations", sizes=(10_000, 100_000), quick=(10_000,))
+def lab4_generate(n):
+    gen = load("LAB4", "lab4.py").CombinationGenerator()
+    return lambda: gen.generate_combinations(REGEX, count=n, seed=1)
+
+@workload("lab4.generate_to", sizes=(100_000, 1_000_000), quick=(100_000,))
+def lab4_generate_to(n):
+    gen = load("LAB4", "lab4.py").CombinationGenerator()
+
+    def run():
+        gen.generate_to(REGEX, io.BytesIO(), n, seed=1, report=False)
+    return run
+
+# ───────────── 5_ChomskyNormalForm: to_cnf stages ─────────────
+def _cnf_stages(lines, **options):
+    cnf = load("5_ChomskyNormalForm", "cnf_variant13.py")
+
+    def run():
+        report = cnf.StageReport()
+        cnf.to_cnf(lines, hook=report, **options)
+        return {e["stage"]: e["seconds"] for e in report.stages}
+    return run
+
+@workload("cnf.long_rhs", sizes=(1000, 10_000, 50_000), quick=(1000, 5000))
+def cnf_long_rhs(n):
+    workloads = load("5_ChomskyNormalForm", "benchmark.py")
+    return _cnf_stages(workloads.long_rhs(n, 8))
+
+@workload("cnf.nullable_chain", sizes=(8, 16, 24), quick=(8, 16))
+def cnf_nullable_chain(k):
+    workloads = load("5_ChomskyNormalForm", "benchmark.py")
+    return _cnf_stages(workloads.nullable_chain(k), bin_first=True)
+
+# ───────────── 5_ChomskyNormalForm: Earley vs CYK ─────────────
+@workload("cnf.cyk.arithmetic", sizes=(50, 100, 200), quick=(50, 100))
+def cnf_cyk_arithmetic(n):
+    workloads = load("5_ChomskyNormalForm", "benchmark.py")
+    cyk = workloads.CYK(workloads.to_cnf(workloads.ARITHMETIC, start="E"), start="E")
+    word = workloads.expression(n)
+    return lambda: cyk.recognize(word)
+
+@workload("cnf.earley.arithmetic", sizes=(50, 100, 200), quick=(50, 100))
+def cnf_earley_arithmetic(n):
+    workloads = load("5_ChomskyNormalForm", "benchmark.py")
+    earley = workloads.Earley(workloads._parse(workloads.ARITHMETIC), start="E")
+    word = workloads.expression(n)
+    return lambda: earley.recognize(word)
+
+@workload("cnf.earley.forest", sizes=(25, 50, 100), quick=(25, 50))
+def cnf_earley_forest(n):
+    workloads = load("5_ChomskyNormalForm", "benchmark.py")
+    earley = workloads.Earley(workloads._parse(workloads.AMBIGUOUS))
+    return lambda: earley.parse("a" * n)
+
+# ───────────── Runner ─────────────
+def measure(fn, repeat):
+    best, parts = float("inf"), {}
+    for _ in range(repeat):
+        t = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t)
+        if isinstance(out, dict):
+            for part, seconds in out.items():
+                parts[part] = min(parts.get(part, float("inf")), seconds)
+    return best, parts
+
+def run(quick=False, repeat=3, only=None):
+    results = {}
+    for name, sizes, quick_sizes, make in WORKLOADS:
+        if only and not any(o in name for o in only):
+            continue
+        for size in quick_sizes if quick else sizes:
+            key = f"{name}[{size}]"
+            try:
+                fn = make(size)
+            except ImportError as e:
+                results[key] = {"skipped": f"{type(e).__name__}: {e}"}
+                print(f"{key:45} skipped ({e})")
+                break
+            seconds, parts = measure(fn, repeat)
+            results[key] = {"size": size, "seconds": seconds}
+            print(f"{key:45} {seconds:10.4f} s")
+            for part, s in parts.items():
+                results[f"{key}.{part}"] = {"size": size, "seconds": s}
+                print(f"  {part:43} {s:10.4f} s")
+    return results
+
+def compare(results, baseline, threshold):
+    """Print current vs baseline; return the keys slower than 1 + threshold."""
+    regressions = []
+    print(f"\n{'workload':45} {'baseline':>10} {'now':>10} {'ratio':>7}")
+    for key, now in results.items():
+        old = baseline.get(key)
+        if not old or "seconds" not in old or "seconds" not in now:
+            continue
+        ratio = now["seconds"] / old["seconds"] if old["seconds"] else 1.0
+        flag = ""
+        # sub-millisecond timings are too noisy to judge
+        if ratio > 1 + threshold and now["seconds"] > 1e-3:
+            regressions.append(key)
+            flag = "  REGRESSION"
+        print(f"{key:45} {old['seconds']:10.4f} {now['seconds']:10.4f} {ratio:7.2f}{flag}")
+    return regressions
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--quick", action="store_true", help="smaller input sizes")
+    ap.add_argument("--repeat", type=int, default=3, help="runs per size (best is kept)")
+    ap.add_argument("--only", action="append", help="substring of workload names to run")
+    ap.add_argument("--output", default=os.path.join(ROOT, "bench_results.json"))
+    ap.add_argument("--baseline", default=os.path.join(ROOT, "bench_baseline.json"))
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    ap.add_argument("--metrics", choices=("json", "prometheus"),
+                    help="instrument the engines (slows them down) and print the counters")
+    args = ap.parse_args()
+    INSTRUMENT = bool(args.metrics)
+
+    results = run(args.quick, args.repeat, args.only)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "quick": args.quick,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+    if args.metrics:
+        snapshot = metrics.METRICS
+        print("\n" + (snapshot.to_json() if args.metrics == "json" else snapshot.to_prometheus()))
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}")
+            sys.exit(1)
+        print("\nNo regressions")
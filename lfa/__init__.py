@@ -0,0 +1,33 @@
+"""
+Importable view of the lab folders.
+
+Each subpackage maps onto one lab directory, so its modules import with no
+dependence on the working directory and without side effects:
+
+    lfa.lab1    LAB1                  grammar + finite automaton (main.py)
+    lfa.lab2    LAB2                  Lab2 (NFA → DFA), lab1_1 (Lab1.1.py)
+    lfa.lab3    LAB3                  command lexer
+    lfa.lab4    LAB4                  CombinationGenerator (lab4)
+    lfa.cnf     5_ChomskyNormalForm   to_cnf, CYK, Earley, CNF cache
+    lfa.parser  6_ParserASTBuild      lexer, LL(1) parser, AST, VM, server
+
+lfa.automata holds the code the LAB1 and LAB2 automata share: grammar →
+NFA/DFA construction, the push-mode Matcher and the byte-table file scanner.
+lfa.lexing holds the LexerSpec both command lexers (LAB3, 6_ParserASTBuild)
+compile their token rules into.
+
+Demos run through the CLI: python -m lfa <demo> (see lfa/__main__.py).
+Nothing is imported until asked for.
+
+The subpackages point into the lab folders beside lfa/, so the package is
+used from this checkout: run from the repository root, or install it in
+place with `pip install -e .` (see pyproject.toml) and import it from
+anywhere, worker processes included.
+"""
+
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def lab_path(folder):
+    return os.path.join(ROOT, folder)
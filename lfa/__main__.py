@@ -0,0 +1,49 @@
+"""
+Run a lab demo:  python -m lfa <demo> [args...]
+
+    python -m lfa list           show the available demos
+    python -m lfa parser         6_ParserASTBuild REPL
+    python -m lfa server --port 8765
+"""
+
+import os
+import runpy
+import sys
+
+from lfa import lab_path
+
+# demo name -> (module, or file, whose __main__ block is the demo, description)
+DEMOS = {
+    "lab1":      ("lfa.lab1.main", "LAB1: generate strings, run the automaton"),
+    "lab1.1":    (os.path.join(lab_path("LAB2"), "Lab1.1.py"), "LAB2/Lab1.1: derivations, NFA, Chomsky class"),
+    "lab2":      ("lfa.lab2.Lab2", "LAB2/Lab2: NFA → DFA, grammar, PNG rendering (graphviz)"),
+    "lab3":      ("lfa.lab3.main", "LAB3: lexer test cases"),
+    "lab4":      ("lfa.lab4.lab4", "LAB4: regex combinations"),
+    "cnf":       ("lfa.cnf.cnf_variant13", "5: CNF conversion of variant 13"),
+    "cyk":       ("lfa.cnf.cyk", "5: CYK recognition and parse trees"),
+    "earley":    ("lfa.cnf.earley", "5: Earley recognition and parse forests"),
+    "cnf-bench": ("lfa.cnf.benchmark", "5: DEL-first vs BIN-first, Earley vs CYK benchmark"),
+    "parser":    ("lfa.parser.main", "6: parse and run scripts, then a REPL"),
+    "server":    ("lfa.parser.server", "6: script validation server"),
+    "loadgen":   ("lfa.parser.loadgen", "6: load generator for the server"),
+}
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in DEMOS:
+        print(__doc__.strip())
+        print("\nDemos:")
+        for name, (_, description) in DEMOS.items():
+            print(f"  {name:10} {description}")
+        return 0 if argv and argv[0] == "list" else 2
+
+    module, _ = DEMOS[argv[0]]
+    sys.argv = [module] + argv[1:]
+    if module.endswith(".py"):
+        runpy.run_path(module, run_name="__main__")
+    else:
+        runpy.run_module(module, run_name="__main__", alter_sys=True)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
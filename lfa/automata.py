@@ -0,0 +1,365 @@
+"""
+Automaton machinery shared by the labs (LAB1/main.py, LAB2/Lab1.1.py and
+LAB2/Lab2.py). Each lab keeps its own FiniteAutomaton with its own
+transition format and hands this module plain tables:
+
+    regular_nfa / determinize   right- or left-linear grammar → NFA → DFA
+    Matcher                     resumable run over chunked input
+    scan_file                   match_file over a memory-mapped file
+"""
+
+import mmap
+import os
+
+EPS = 'ε'
+
+# ───────────── Regular grammar → NFA → DFA ─────────────
+def linearity(VN, P, start):
+    """
+    One pass over the productions. Returns (right, left, type2, type1):
+    whether every production is right-linear (A → wB | w), left-linear
+    (A → Bw | w), has a single nonterminal on the left, and does not shrink
+    (apart from S → ε).
+    """
+    right = left = type2 = type1 = True
+    for lhs, productions in P.items():
+        if len(lhs) != 1 or lhs not in VN:
+            type2 = right = left = False
+        for production in productions:
+            body = "" if production == EPS else production
+            if len(body) < len(lhs) and not (lhs == start and not body):
+                type1 = False
+            if right or left:
+                positions = [i for i, symbol in enumerate(body) if symbol in VN]
+                if len(positions) > 1:
+                    right = left = False
+                elif positions:
+                    right = right and positions[0] == len(body) - 1
+                    left = left and positions[0] == 0
+    return right, left, type2, type1
+
+def regular_nfa(fingerprint):
+    """
+    ε-free NFA of a right- or left-linear grammar given as a fingerprint
+    (start, nonterminals, terminals, ((A, productions), ...)). Returns
+    (states, transitions, initial, accept_states) with transitions as
+    state -> symbol -> set of states.
+
+    Right-linear: one state qA per nonterminal plus a final state;
+    A → a1..ak B becomes a chain qA -a1-> … -ak-> qB (k-1 fresh states) and
+    A → w ends in the final state. Left-linear grammars are read backwards:
+    a fresh initial state, A → B w is a chain qB -w-> qA, A → w starts at the
+    initial state, and qS is final. Unit and ε-productions become
+    ε-moves, which are removed at the end by ε-closure.
+    """
+    start, VN, _, P = fingerprint
+    VN, P = set(VN), dict(P)
+    right, left, _, _ = linearity(VN, P, start)
+    if not (right or left):
+        raise ValueError("Grammar is not right- or left-linear, so it has no finite automaton")
+
+    taken = {f"q{A}" for A in VN}
+
+    def fresh(name):
+        while name in taken:
+            name += "'"
+        taken.add(name)
+        return name
+
+    extra = fresh("qF" if right else "qI")
+    moves, eps = {}, {}
+    counter = 0
+
+    def path(source, word, target):
+        nonlocal counter
+        if not word:
+            eps.setdefault(source, set()).add(target)
+            return
+        for symbol in word[:-1]:
+            counter += 1
+            step = fresh(f"q{counter}")
+            moves.setdefault(source, {}).setdefault(symbol, set()).add(step)
+            source = step
+        moves.setdefault(source, {}).setdefault(word[-1], set()).add(target)
+
+    for A, productions in P.items():
+        for production in productions:
+            body = "" if production == EPS else production
+            if right:
+                if body and body[-1] in VN:
+                    path(f"q{A}", body[:-1], f"q{body[-1]}")
+                else:
+                    path(f"q{A}", body, extra)
+            else:
+                if body and body[0] in VN:
+                    path(f"q{body[0]}", body[1:], f"q{A}")
+                else:
+                    path(extra, body, f"q{A}")
+    initial, finals = (f"q{start}", {extra}) if right else (extra, {f"q{start}"})
+
+    def closure(state):
+        seen, stack = {state}, [state]
+        while stack:
+            for nxt in eps.get(stack.pop(), ()):
+                if nxt not in seen:
+                    seen.add(nxt)
+                    stack.append(nxt)
+        return seen
+
+    # ε-free NFA over the states reachable from the initial one
+    transitions, accept_states = {}, set()
+    states, todo = {initial}, [initial]
+    while todo:
+        state = todo.pop()
+        reach = closure(state)
+        if reach & finals:
+            accept_states.add(state)
+        for q in reach:
+            for symbol, dests in moves.get(q, {}).items():
+                transitions.setdefault(state, {}).setdefault(symbol, set()).update(dests)
+        for dests in transitions.get(state, {}).values():
+            for d in dests - states:
+                states.add(d)
+                todo.append(d)
+    return states, transitions, initial, accept_states
+
+def determinize(transitions, initial, accept_states):
+    """
+    Subset construction over an NFA in regular_nfa's format. Returns
+    (states, transitions, start_state, accept_states) with transitions as
+    state -> symbol -> state; subset states are named by joining their
+    members with '+'.
+    """
+    def name(subset):
+        return '+'.join(sorted(subset))
+
+    first = frozenset([initial])
+    dfa, accepting = {}, set()
+    seen, todo = {first}, [first]
+    while todo:
+        subset = todo.pop()
+        dfa[name(subset)] = row = {}
+        if subset & accept_states:
+            accepting.add(name(subset))
+        targets = {}
+        for q in subset:
+            for symbol, dests in transitions.get(q, {}).items():
+                targets.setdefault(symbol, set()).update(dests)
+        for symbol, dests in sorted(targets.items()):
+            nxt = frozenset(dests)
+            row[symbol] = name(nxt)
+            if nxt not in seen:
+                seen.add(nxt)
+                todo.append(nxt)
+    return set(dfa), dfa, name(first), accepting
+
+# ───────────── Push-mode matching ─────────────
+class Matcher:
+    """
+    Resumable run of a finite automaton (NFA or DFA) over input that arrives
+    in pieces: feed() any number of chunks (str, or bytes read from a socket
+    or pipe), then ask is_accepting(). Only the current set of states is
+    kept between chunks. States that cannot reach an accept state are
+    dropped; once the set is empty the matcher is dead and later input is
+    ignored.
+
+    `tables` comes from Matcher.tables and is built once per automaton
+    (see each lab's FiniteAutomaton.matcher), so a new matcher is cheap.
+    """
+
+    def __init__(self, fa, tables):
+        self.fa = fa
+        self.moves, self.live, self.final = tables
+        self.reset()
+
+    @staticmethod
+    def tables(moves, accept_states):
+        """
+        (moves, live, final) from transitions given as state -> symbol ->
+        set of states: live are the states that can still reach an accept
+        state.
+        """
+        final = set(accept_states)
+        live = set(final)
+        changed = True
+        while changed:
+            changed = False
+            for state, by_symbol in moves.items():
+                if state not in live and any(d & live for d in by_symbol.values()):
+                    live.add(state)
+                    changed = True
+        return moves, live, final
+
+    def reset(self):
+        self.states = {self.fa.start_state} & self.live
+        self.position = 0  # symbols consumed so far
+
+    def feed(self, chunk):
+        """Consume `chunk`; return False once the matcher is dead."""
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            chunk = bytes(chunk).decode("latin-1")
+        states = self.states
+        if not states:
+            return False
+        moves, live = self.moves, self.live
+        consumed = 0  # counted, as the input may not support len()
+        for symbol in chunk:
+            consumed += 1
+            next_states = set()
+            for state in states:
+                next_states.update(moves.get(state, {}).get(symbol, ()))
+            states = next_states & live
+            if not states:
+                self.states = states
+                self.position += consumed
+                return False
+        self.states = states
+        self.position += consumed
+        return True
+
+    def is_accepting(self):
+        return bool(self.states & self.final)
+
+    def is_dead(self):
+        return not self.states
+
+# ───────────── Byte-level corpus scanning (match_file) ─────────────
+def _lines(mm, start, stop):
+    """(begin, end) of each line in mm[start:stop], without '\\n' / '\\r\\n'."""
+    pos = start
+    while pos < stop:
+        end = mm.find(b"\n", pos, stop)
+        if end < 0:
+            end = stop
+        yield pos, (end - 1 if end > pos and mm[end - 1] == 13 else end)
+        pos = end + 1
+
+def _scan_python(mm, table, accepting, offsets, start=0, stop=None):
+    dead = len(table) - 1
+    view = memoryview(mm)
+    accepted = rejected = 0
+    found = []
+    try:
+        for begin, end in _lines(mm, start, len(mm) if stop is None else stop):
+            state = 0
+            for b in view[begin:end]:
+                state = table[state][b]
+                if state == dead:
+                    break  # the rest of the line cannot change the answer
+            if accepting[state]:
+                accepted += 1
+                if offsets:
+                    found.append(begin)
+            else:
+                rejected += 1
+    finally:
+        view.release()
+    return accepted, rejected, found
+
+# lines longer than this are left to the scalar loop
+_VECTOR_MAX_LINE = 4096
+_BLOCK = 64 << 20
+
+def _scan_numpy(mm, table, accepting, offsets):
+    """
+    Vectorized scan: all lines of a block advance one byte per step, longest
+    lines first so the still-running ones always form a prefix.
+    """
+    import numpy as np
+
+    dead = len(table) - 1
+    flat = np.asarray(table, dtype=np.int64).ravel()
+    acc = np.asarray(accepting, dtype=bool)
+    buf = np.frombuffer(mm, dtype=np.uint8)
+    try:
+        accepted = rejected = 0
+        found = []
+        a = 0
+        while a < len(buf):
+            # blocks end right after a newline, so no line is split
+            b = min(a + _BLOCK, len(buf))
+            if b < len(buf):
+                cut = mm.rfind(b"\n", a, b)
+                b = cut + 1 if cut >= 0 else (mm.find(b"\n", b) + 1 or len(buf))
+            block = buf[a:b]
+            nl = np.flatnonzero(block == 10)
+            raw_ends = nl if len(nl) and nl[-1] == len(block) - 1 else np.append(nl, len(block))
+            starts = np.concatenate(([0], raw_ends[:-1] + 1))
+            ends = raw_ends - ((raw_ends > starts) & (block[np.maximum(raw_ends - 1, 0)] == 13))
+            lengths = ends - starts
+
+            long_lines = lengths > _VECTOR_MAX_LINE
+            for begin, end in zip(starts[long_lines].tolist(), raw_ends[long_lines].tolist()):
+                got, missed, where = _scan_python(mm, table, accepting, offsets, a + begin, a + end)
+                accepted += got
+                rejected += missed
+                found.extend(where)
+            starts, lengths = starts[~long_lines], lengths[~long_lines]
+
+            order = np.argsort(-lengths, kind="stable")
+            starts, lengths = starts[order], lengths[order]
+            ascending = lengths[::-1]
+            state = np.zeros(len(starts), dtype=np.int64)
+            index = np.empty_like(state)
+            byte = np.empty(len(state), dtype=np.uint8)
+            for k in range(int(lengths[0]) if len(lengths) else 0):
+                if k % 8 == 7:
+                    # drop lines that hit the dead state: they are rejected
+                    alive = state != dead
+                    if not alive.all():
+                        rejected += len(state) - int(alive.sum())
+                        starts, lengths, state = starts[alive], lengths[alive], state[alive]
+                        ascending = lengths[::-1]
+                        if not len(state):
+                            break
+                n = len(ascending) - int(np.searchsorted(ascending, k, side="right"))
+                # state = flat[state * 256 + block[start + k]], without temporaries
+                np.add(starts[:n], k, out=index[:n])
+                np.take(block, index[:n], out=byte[:n])
+                np.multiply(state[:n], 256, out=index[:n])
+                np.add(index[:n], byte[:n], out=index[:n])
+                np.take(flat, index[:n], out=state[:n])
+
+            ok = acc[state]
+            accepted += int(ok.sum())
+            rejected += len(ok) - int(ok.sum())
+            if offsets:
+                found.extend((starts[ok] + a).tolist())
+            a = b
+    finally:
+        # views into the map must be gone before match_file closes it
+        buf = block = None
+    if offsets:
+        found.sort()
+    return accepted, rejected, found
+
+def scan_file(table, accepting, path, offsets=False, engine="auto"):
+    """
+    match_file over a byte table (see the labs' byte_table): the file is
+    memory-mapped and the table is applied to the buffer directly,
+    restarting at each newline (a trailing '\\r' is ignored).
+
+    Returns {"accepted", "rejected"} and, with `offsets`, the sorted byte
+    offsets of the accepted lines under "offsets". `engine` is "python",
+    "numpy" (vectorized over all lines at once) or "auto" (NumPy if it is
+    installed).
+    """
+    if engine == "auto":
+        try:
+            import numpy  # noqa: F401
+            engine = "numpy"
+        except ImportError:
+            engine = "python"
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            result = {"accepted": 0, "rejected": 0}
+            return dict(result, offsets=[]) if offsets else result
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            scan = _scan_numpy if engine == "numpy" else _scan_python
+            accepted, rejected, found = scan(mm, table, accepting, offsets)
+
+    result = {"accepted": accepted, "rejected": rejected}
+    if offsets:
+        result["offsets"] = found
+    return result
@@ -0,0 +1,5 @@
+"""Chomsky normal form conversion, CYK, Earley and the CNF cache."""
+
+from lfa import lab_path
+
+__path__ = [lab_path("5_ChomskyNormalForm")]
@@ -0,0 +1,5 @@
+"""Grammar and finite automaton from LAB1."""
+
+from lfa import lab_path
+
+__path__ = [lab_path("LAB1")]
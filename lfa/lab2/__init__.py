@@ -0,0 +1,31 @@
+"""Finite automata from LAB2: Lab2 (NFA → DFA) and lab1_1 (Lab1.1.py)."""
+
+import importlib
+import importlib.abc
+import importlib.util
+import os
+import sys
+
+from lfa import lab_path
+
+__path__ = [lab_path("LAB2")]
+
+# Lab1.1.py is not a valid module name; it is exposed as lfa.lab2.lab1_1
+_ALIASES = {"lab1_1": "Lab1.1.py"}
+
+class _AliasFinder(importlib.abc.MetaPathFinder):
+    """Lets `import lfa.lab2.lab1_1` find the aliased files, not only getattr."""
+
+    def find_spec(self, fullname, path=None, target=None):
+        package, _, name = fullname.rpartition(".")
+        if package != __name__ or name not in _ALIASES:
+            return None
+        return importlib.util.spec_from_file_location(
+            fullname, os.path.join(__path__[0], _ALIASES[name]))
+
+sys.meta_path.append(_AliasFinder())
+
+def __getattr__(name):
+    if name not in _ALIASES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return importlib.import_module(f"{__name__}.{name}")
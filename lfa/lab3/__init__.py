@@ -0,0 +1,5 @@
+"""Command lexer from LAB3."""
+
+from lfa import lab_path
+
+__path__ = [lab_path("LAB3")]
@@ -0,0 +1,5 @@
+"""Regex combination generator from LAB4."""
+
+from lfa import lab_path
+
+__path__ = [lab_path("LAB4")]
@@ -0,0 +1,81 @@
+"""
+Compiled lexer specification shared by the command lexers (LAB3/lexer.py
+and 6_ParserASTBuild/lexer.py). Each lab keeps its own TokenType, Token
+class and error wording and passes them in.
+"""
+
+import re
+from collections import namedtuple
+
+# Outcome of one tokenize call; each call gets its own lists
+LexResult = namedtuple("LexResult", "tokens errors")
+
+class LexerSpec:
+    """
+    Immutable, compiled token rules. The patterns are tried in order and
+    the first match wins, which is also how a regex alternation behaves, so
+    they are compiled once into a single pattern whose named group tells
+    which rule matched. A spec keeps no state between calls, so one
+    instance can serve any number of concurrent tokenize calls.
+
+    `token(type, value, line)` builds a token; types in `skip` (comments)
+    are matched but not emitted; `eof` is the type of the closing token;
+    `error` is formatted with line_number, token and line for every word
+    that no pattern matches.
+    """
+
+    __slots__ = ("patterns", "token", "eof", "_skip", "_error",
+                 "_master", "_types", "_space", "_word")
+
+    def __init__(self, patterns, token, eof, skip=(),
+                 error="Line {line_number}: Unexpected token '{token}' in: {line}"):
+        patterns = tuple(patterns)
+        setup = object.__setattr__
+        setup(self, "patterns", patterns)
+        setup(self, "token", token)
+        setup(self, "eof", eof)
+        setup(self, "_skip", frozenset(skip))
+        setup(self, "_error", error)
+        setup(self, "_master", re.compile("|".join(
+            f"(?P<t{i}>{pattern})" for i, (pattern, _) in enumerate(patterns))))
+        setup(self, "_types", {f"t{i}": ttype for i, (_, ttype) in enumerate(patterns)})
+        setup(self, "_space", re.compile(r'\s*'))
+        setup(self, "_word", re.compile(r'\S+'))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("LexerSpec is immutable")
+
+    def iter_tokens(self, text, errors):
+        """
+        Yield tokens lazily, one line at a time, ending with EOF. Errors are
+        appended to `errors` as their line is reached.
+        """
+        match, types = self._master.match, self._types
+        space, word = self._space.match, self._word.match
+        token, skip, error = self.token, self._skip, self._error
+        lines = text.split('\n')
+        for line_number, line in enumerate(lines, start=1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+
+            # positions instead of slices: the rest of the line is never copied
+            pos, end = 0, len(line)
+            while pos < end:
+                m = match(line, pos)
+                if m:
+                    ttype = types[m.lastgroup]
+                    if ttype not in skip:
+                        yield token(ttype, m.group(), line_number)
+                    pos = space(line, m.end()).end()
+                else:
+                    bad = word(line, pos)
+                    errors.append(error.format(
+                        line_number=line_number, token=bad.group(), line=line))
+                    pos = space(line, bad.end()).end()
+
+        yield token(self.eof, None, len(lines))
+
+    def tokenize(self, text):
+        errors = []
+        return LexResult(list(self.iter_tokens(text, errors)), errors)
@@ -0,0 +1,5 @@
+"""Command language lexer, parser, AST, VM and validation server."""
+
+from lfa import lab_path
+
+__path__ = [lab_path("6_ParserASTBuild")]
@@ -0,0 +1,341 @@
+"""
+Opt-in instrumentation for the engines in this repository.
+
+Nothing here runs unless asked for: `instrument(module)` swaps counting
+wrappers onto the engines a module defines, and `uninstrument()` puts the
+original functions back. Code that was never instrumented runs exactly as
+written, so there is no cost when this is off.
+
+    import metrics
+    metrics.instrument(lexer_module)
+    ...
+    print(metrics.METRICS.to_prometheus())
+
+Counters:
+    lexer      - calls, tokens, bytes, errors, seconds
+                 (tokens per second is derived)
+    automaton  - accepts() calls, steps, accepted, dead-state hits
+                 (rejections that ran out of states); to_dfa() calls,
+                 subset states, get_transitions() calls made by the
+                 subset construction
+    cnf        - productions added/removed and seconds per to_cnf stage
+    generator  - CombinationGenerator draws
+
+`profiled(label)` wraps any entry point in cProfile and tracemalloc, and
+`python metrics.py path/to/script.py` runs a lab script under it.
+"""
+
+import argparse
+import contextlib
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import runpy
+import sys
+import time
+import tracemalloc
+
+# ───────────── Registry ─────────────
+class Metrics:
+    """Counters and gauges keyed by name and a sorted tuple of labels."""
+
+    def __init__(self):
+        self.values = {}
+        self.kinds = {}
+        self.profiles = {}
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        self.kinds[name] = "counter"
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def set(self, name, value, **labels):
+        self.kinds[name] = "gauge"
+        self.values[(name, tuple(sorted(labels.items())))] = value
+
+    def get(self, name, **labels):
+        return self.values.get((name, tuple(sorted(labels.items()))), 0)
+
+    def reset(self):
+        self.values.clear()
+        self.kinds.clear()
+        self.profiles.clear()
+
+    def _derived(self):
+        """Rates computed from the raw counters at snapshot time."""
+        out = {}
+        for (name, labels), value in self.values.items():
+            if name != "lexer_tokens_total":
+                continue
+            lb = dict(labels)
+            seconds = self.get("lexer_seconds_total", **lb)
+            if seconds:
+                out[("lexer_tokens_per_second", labels)] = value / seconds
+        return out
+
+    def snapshot(self):
+        """List of {"name", "type", "labels", "value"} records."""
+        records = [
+            {"name": name, "type": self.kinds[name], "labels": dict(labels), "value": value}
+            for (name, labels), value in sorted(self.values.items())
+        ]
+        records += [
+            {"name": name, "type": "gauge", "labels": dict(labels), "value": value}
+            for (name, labels), value in sorted(self._derived().items())
+        ]
+        return records
+
+    def to_json(self, indent=2):
+        return json.dumps(
+            {"time": time.time(), "metrics": self.snapshot(), "profiles": self.profiles},
+            indent=indent,
+        )
+
+    def to_prometheus(self, prefix="lfa_"):
+        """Prometheus text exposition format."""
+        lines, typed = [], set()
+        for rec in self.snapshot():
+            name = prefix + rec["name"]
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {rec['type']}")
+            labels = ",".join(f'{k}="{_escape(v)}"' for k, v in sorted(rec["labels"].items()))
+            lines.append(f"{name}{{{labels}}} {rec['value']}" if labels else f"{name} {rec['value']}")
+        return "\n".join(lines) + "\n"
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+METRICS = Metrics()
+
+# ───────────── Probes ─────────────
+_patched = []  # (owner, attribute, original)
+
+def _patch(owner, attr, make):
+    original = getattr(owner, attr)
+    if getattr(original, "__instrumented__", False):
+        return
+    wrapper = functools.wraps(original)(make(original))
+    wrapper.__instrumented__ = True
+    setattr(owner, attr, wrapper)
+    _patched.append((owner, attr, original))
+
+def _probe_lexer(cls):
+    def make(tokenize):
+        def wrapper(self, text):
+            # one LexerSpec class serves every lexer: label by the lab that
+            # owns the spec's token class
+            where = self.token.__module__
+            t = time.perf_counter()
+            result = tokenize(self, text)
+            seconds = time.perf_counter() - t
+            tokens = sum(1 for tok in result.tokens if tok.type.name != "EOF")
+            METRICS.inc("lexer_calls_total", 1, engine=where)
+            METRICS.inc("lexer_tokens_total", tokens, engine=where)
+            METRICS.inc("lexer_bytes_total", len(text), engine=where)
+            METRICS.inc("lexer_errors_total", len(result.errors), engine=where)
+            METRICS.inc("lexer_seconds_total", seconds, engine=where)
+            return result
+        return wrapper
+    _patch(cls, "tokenize", make)
+
+class _Counted:
+    """Iterable over a word that counts the symbols actually read."""
+    __slots__ = ("word", "read")
+
+    def __init__(self, word):
+        self.word = word
+        self.read = 0
+
+    def __len__(self):
+        return len(self.word)
+
+    def __iter__(self):
+        for ch in self.word:
+            self.read += 1
+            yield ch
+
+# > 0 while a to_dfa() call is running, outside its is_deterministic() check
+_subset_construction = [0]
+
+def _probe_automaton(cls, where):
+    if hasattr(cls, "accepts"):
+        def make_accepts(accepts):
+            def wrapper(self, word):
+                counted = _Counted(word)
+                ok = accepts(self, counted)
+                METRICS.inc("fa_accepts_calls_total", 1, engine=where)
+                METRICS.inc("fa_steps_total", counted.read, engine=where)
+                if ok:
+                    METRICS.inc("fa_accepted_total", 1, engine=where)
+                elif hasattr(self, "matcher"):
+                    # rejected: replay it to tell running out of states
+                    # (even on the last symbol) from ending in a non-final one
+                    matcher = self.matcher()
+                    matcher.feed(word)
+                    if matcher.is_dead():
+                        METRICS.inc("fa_dead_state_hits_total", 1, engine=where)
+                return ok
+            return wrapper
+        _patch(cls, "accepts", make_accepts)
+
+    if hasattr(cls, "get_transitions"):
+        def make_get(get_transitions):
+            def wrapper(self, state, symbol):
+                if _subset_construction[0]:
+                    METRICS.inc("fa_get_transitions_calls_total", 1, engine=where)
+                return get_transitions(self, state, symbol)
+            return wrapper
+        _patch(cls, "get_transitions", make_get)
+
+    if hasattr(cls, "is_deterministic"):
+        def make_is_deterministic(is_deterministic):
+            def wrapper(self):
+                # its scan is not part of the subset construction
+                saved, _subset_construction[0] = _subset_construction[0], 0
+                try:
+                    return is_deterministic(self)
+                finally:
+                    _subset_construction[0] = saved
+            return wrapper
+        _patch(cls, "is_deterministic", make_is_deterministic)
+
+    if hasattr(cls, "to_dfa"):
+        def make_to_dfa(to_dfa):
+            def wrapper(self):
+                t = time.perf_counter()
+                _subset_construction[0] += 1
+                try:
+                    dfa = to_dfa(self)
+                finally:
+                    _subset_construction[0] -= 1
+                METRICS.inc("fa_to_dfa_calls_total", 1, engine=where)
+                METRICS.inc("fa_to_dfa_seconds_total", time.perf_counter() - t, engine=where)
+                if dfa is not self:
+                    METRICS.inc("fa_subset_states_total", len(dfa.states), engine=where)
+                return dfa
+            return wrapper
+        _patch(cls, "to_dfa", make_to_dfa)
+
+def _probe_generator(cls, where):
+    def make_combinations(generate):
+        def wrapper(self, regex_str, count=10, seed=None):
+            out = generate(self, regex_str, count, seed)
+            METRICS.inc("generator_draws_total", len(out), engine=where)
+            return out
+        return wrapper
+    _patch(cls, "generate_combinations", make_combinations)
+
+    if hasattr(cls, "generate_to"):
+        def make_to(generate_to):
+            def wrapper(self, regex_str, path_or_fileobj, count, *args, **kwargs):
+                out = generate_to(self, regex_str, path_or_fileobj, count, *args, **kwargs)
+                METRICS.inc("generator_draws_total", count, engine=where)
+                return out
+            return wrapper
+        _patch(cls, "generate_to", make_to)
+
+def _probe_cnf(module, where):
+    def make(to_cnf):
+        def wrapper(lines, *args, hook=None, **kwargs):
+            last = [None]
+
+            def count(event):
+                size = event["productions"]
+                if last[0] is not None:
+                    delta = size - last[0]
+                    if delta > 0:
+                        METRICS.inc("cnf_productions_added_total", delta, stage=event["stage"], engine=where)
+                    elif delta < 0:
+                        METRICS.inc("cnf_productions_removed_total", -delta, stage=event["stage"], engine=where)
+                last[0] = size
+                METRICS.inc("cnf_stage_seconds_total", event["seconds"], stage=event["stage"], engine=where)
+                if hook is not None:
+                    hook(event)
+
+            METRICS.inc("cnf_calls_total", 1, engine=where)
+            return to_cnf(lines, *args, hook=count, **kwargs)
+        return wrapper
+    _patch(module, "to_cnf", make)
+
+def instrument(module):
+    """Attach probes to every known engine defined in `module`."""
+    where = module.__name__
+    for name, obj in list(vars(module).items()):
+        if not isinstance(obj, type):
+            continue
+        if name == "LexerSpec":  # imported from lfa.lexing
+            _probe_lexer(obj)
+        elif obj.__module__ != module.__name__:
+            continue
+        elif name == "FiniteAutomaton":
+            _probe_automaton(obj, where)
+        elif name == "CombinationGenerator":
+            _probe_generator(obj, where)
+    if callable(getattr(module, "to_cnf", None)) and hasattr(module, "StageReport"):
+        _probe_cnf(module, where)
+    return module
+
+def uninstrument():
+    """Restore every wrapped function."""
+    while _patched:
+        owner, attr, original = _patched.pop()
+        setattr(owner, attr, original)
+
+# ───────────── Profiling hook ─────────────
+@contextlib.contextmanager
+def profiled(label, cpu=True, memory=True, top=15, stream=None):
+    """
+    Profile the enclosed block with cProfile and/or tracemalloc. Wall time
+    and peak traced memory become gauges labelled `entry=label`; the cProfile
+    table (top functions by cumulative time) is kept in METRICS.profiles and
+    also written to `stream` if given.
+    """
+    prof = cProfile.Profile() if cpu else None
+    started_tracing = memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if memory:
+        tracemalloc.reset_peak()
+    t = time.perf_counter()
+    if prof:
+        prof.enable()
+    try:
+        yield METRICS
+    finally:
+        if prof:
+            prof.disable()
+        METRICS.set("profile_seconds", time.perf_counter() - t, entry=label)
+        if memory:
+            METRICS.set("profile_peak_bytes", tracemalloc.get_traced_memory()[1], entry=label)
+            if started_tracing:
+                tracemalloc.stop()
+        if prof:
+            text = io.StringIO()
+            pstats.Stats(prof, stream=text).sort_stats("cumulative").print_stats(top)
+            METRICS.profiles[label] = text.getvalue()
+            if stream is not None:
+                stream.write(text.getvalue())
+
+# ──────────────────────── Main ────────────────────────
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Run a lab script under cProfile/tracemalloc")
+    ap.add_argument("script", help="e.g. 6_ParserASTBuild/main.py")
+    ap.add_argument("args", nargs=argparse.REMAINDER)
+    ap.add_argument("--top", type=int, default=15)
+    ap.add_argument("--no-memory", action="store_true", help="skip tracemalloc")
+    ap.add_argument("--format", choices=("json", "prometheus"), default="prometheus")
+    opts = ap.parse_args()
+
+    script = os.path.abspath(opts.script)
+    sys.argv = [script] + opts.args
+    sys.path.insert(0, os.path.dirname(script))
+    try:
+        with profiled(opts.script, memory=not opts.no_memory, top=opts.top, stream=sys.stderr):
+            runpy.run_path(script, run_name="__main__")
+    finally:
+        out = METRICS.to_json() if opts.format == "json" else METRICS.to_prometheus()
+        sys.stderr.write("\n" + out)
@@ -0,0 +1,74 @@
+import itertools
+import random
+
+import pytest
+
+from lfa import automata
+from lfa.lab1 import main as lab1
+from lfa.lab2 import Lab2, lab1_1
+
+
+def test_labs_share_the_matcher():
+    assert lab1.Matcher is lab1_1.Matcher is Lab2.Matcher is automata.Matcher
+
+
+def test_matcher_agrees_with_accepts():
+    grammar = lab1.Grammar()
+    dfa, nfa = grammar.to_finite_automaton(), lab1_1.Grammar().to_finite_automaton()
+    for n in range(6):
+        for word in map("".join, itertools.product("abc", repeat=n)):
+            for fa in (dfa, nfa):
+                m = fa.matcher()
+                m.feed(word[:2])
+                m.feed(word[2:])
+                assert m.is_accepting() == fa.accepts(word)
+
+
+def write_corpus(path, words, seed=0):
+    """Mixed \\n / \\r\\n endings, no final newline, and some non-ASCII bytes."""
+    rnd = random.Random(seed)
+    data = bytearray()
+    starts = []
+    for i, w in enumerate(words):
+        starts.append(len(data))
+        data += w.encode()
+        if i < len(words) - 1:
+            data += b"\r\n" if rnd.random() < 0.3 else b"\n"
+    path.write_bytes(bytes(data))
+    return starts
+
+
+@pytest.mark.parametrize("make", [
+    lambda: (lab1.Grammar().to_finite_automaton(), "abcx"),
+    lambda: (Lab2.FiniteAutomaton(
+        ["q0", "q1", "q2", "q3"], ["a", "b"],
+        {("q0", "a"): "q0", ("q0", "b"): "q1", ("q1", "a"): ["q1", "q2"],
+         ("q1", "b"): "q3", ("q2", "a"): "q2", ("q2", "b"): "q3"},
+        "q0", ["q3"]), "abé"),
+])
+def test_match_file_engines_agree_with_accepts(tmp_path, make):
+    fa, alphabet = make()
+    rnd = random.Random(1)
+    words = ["".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 12)))
+             for _ in range(2000)]
+    if isinstance(fa, lab1.FiniteAutomaton):
+        words += lab1.Grammar().generate_valid_strings(200)
+    # longer than the vectorized engine's line limit: handled separately
+    words += ["a" * (automata._VECTOR_MAX_LINE + 10)]
+    rnd.shuffle(words)
+    path = tmp_path / "corpus.txt"
+    starts = write_corpus(path, words)
+
+    expected = [s for s, w in zip(starts, words) if fa.accepts(w)]
+    assert expected  # the corpus has accepted lines
+    for engine in ("python", "numpy", "auto"):
+        result = fa.match_file(str(path), offsets=True, engine=engine)
+        assert result == {"accepted": len(expected), "rejected": len(words) - len(expected),
+                          "offsets": expected}, engine
+
+
+def test_match_file_on_an_empty_file(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    fa = lab1.Grammar().to_finite_automaton()
+    assert fa.match_file(str(path), offsets=True) == {"accepted": 0, "rejected": 0, "offsets": []}
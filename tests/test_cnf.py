@@ -0,0 +1,74 @@
+import itertools
+import json
+
+from lfa.cnf.benchmark import nullable_chain
+from lfa.cnf.cnf_variant13 import StageReport, to_cnf
+from lfa.cnf.cyk import CYK
+
+VARIANT_13 = ["S->aB", "S->DA", "A->a", "A->BD", "A->bDAB",
+              "B->b", "B->BA", "D->ε", "D->BA", "C->BA"]
+
+
+def is_cnf(g, start="S"):
+    for A, prods in g.items():
+        for p in prods:
+            if len(p) == 2:
+                assert all(s in g for s in p), (A, p)
+            elif len(p) == 1:
+                assert p[0] not in g, (A, p)
+            else:
+                assert A == start and p == (), (A, p)
+    return True
+
+
+def words(alphabet, up_to):
+    for n in range(up_to + 1):
+        yield from map("".join, itertools.product(alphabet, repeat=n))
+
+
+def test_both_pass_orders_keep_the_start_and_the_language():
+    for lines in (VARIANT_13, ["S->aSb|ε"], ["S->SS|a|ε"]):
+        classic = to_cnf(lines, start="S")
+        bin_first = to_cnf(lines, start="S", bin_first=True)
+        assert is_cnf(classic) and is_cnf(bin_first)
+        a, b = CYK(classic, start="S"), CYK(bin_first, start="S")
+        for w in words("ab", 6):
+            assert a.recognize(w) == b.recognize(w), (lines, w)
+
+
+def test_fresh_start_takes_over_the_start_name():
+    g = to_cnf(["S->aSb|ε"], start="S", bin_first=True)
+    assert () in g["S"] and "S0" in g
+    assert not any("S" in p for prods in g.values() for p in prods)
+
+
+def test_nullable_chain_names_do_not_collide_with_the_start():
+    lines = nullable_chain(24)
+    assert not any("S" in line.split("->")[1] for line in lines)
+    g = to_cnf(lines, bin_first=True)
+    cyk = CYK(g, start="S")
+    assert cyk.recognize("a" * 24) and cyk.recognize("") and not cyk.recognize("a" * 25)
+
+
+def test_quiet_by_default_with_one_hook_event_per_stage(capsys):
+    report = StageReport()
+    to_cnf(VARIANT_13, hook=report)
+    assert capsys.readouterr().out == ""
+    assert [e["stage"] for e in report.stages] == ["PARSE", "DEL", "UNIT", "USELESS", "TERM", "BIN"]
+    final = report.stages[-1]
+    assert final["productions"] == sum(len(p) for p in to_cnf(VARIANT_13).values())
+    assert final["peak_productions"] == max(e["productions"] for e in report.stages)
+    data = json.loads(report.to_json())
+    assert data["peak_productions"] == final["peak_productions"]
+
+
+def test_bin_first_stage_order():
+    report = StageReport()
+    to_cnf(VARIANT_13, bin_first=True, hook=report)
+    assert [e["stage"] for e in report.stages] == [
+        "PARSE", "START", "TERM", "BIN", "DEL", "UNIT", "USELESS"]
+
+
+def test_verbose_prints_every_stage(capsys):
+    to_cnf(VARIANT_13, verbose=True)
+    assert capsys.readouterr().out.count("►") == 6
@@ -0,0 +1,54 @@
+import os
+
+from lfa.cnf.cnf_cache import CNFCache
+from lfa.cnf.cnf_variant13 import to_cnf
+
+VARIANT_13 = ["S->aB", "S->DA", "A->a", "A->BD", "A->bDAB",
+              "B->b", "B->BA", "D->ε", "D->BA", "C->BA"]
+
+
+def test_hit_skips_the_pipeline_and_survives_a_new_process(tmp_path):
+    cache = CNFCache(str(tmp_path))
+    stages = []
+    first = to_cnf(VARIANT_13, cache=cache, hook=stages.append)
+    assert stages and first == to_cnf(VARIANT_13)
+    stages.clear()
+    assert to_cnf(VARIANT_13, cache=cache, hook=stages.append) == first
+    assert stages == []
+    # a fresh instance has an empty memo, so this one comes from disk
+    assert to_cnf(VARIANT_13, cache=CNFCache(str(tmp_path)), hook=stages.append) == first
+    assert stages == []
+
+
+def test_start_and_options_are_part_of_the_key(tmp_path):
+    cache = CNFCache(str(tmp_path))
+    keys = {cache.key_for(VARIANT_13, "S"), cache.key_for(VARIANT_13, "A"),
+            cache.key_for(VARIANT_13, "S", bin_first=True)}
+    assert len(keys) == 3
+    assert to_cnf(VARIANT_13, bin_first=True, cache=cache) == to_cnf(VARIANT_13, bin_first=True)
+
+
+def test_hits_are_copies(tmp_path):
+    cache = CNFCache(str(tmp_path))
+    g = to_cnf(VARIANT_13, cache=cache)
+    g["S"].clear()
+    g["NEW"] = {("a",)}
+    again = to_cnf(VARIANT_13, cache=cache)
+    assert again == to_cnf(VARIANT_13) and again["S"]
+
+
+def test_eviction_and_clear_only_touch_entries(tmp_path):
+    foreign = tmp_path / "notes.txt"
+    foreign.write_text("keep me")
+    cache = CNFCache(str(tmp_path), max_bytes=1)
+    to_cnf(VARIANT_13, cache=cache)
+    to_cnf(["S->aSb|ε"], cache=cache)
+    # every entry is over max_bytes, so all of them go; the foreign file stays
+    assert os.listdir(tmp_path) == ["notes.txt"]
+    assert to_cnf(VARIANT_13, cache=cache) == to_cnf(VARIANT_13)  # memo still serves it
+    cache = CNFCache(str(tmp_path))
+    to_cnf(VARIANT_13, cache=cache)
+    assert len(os.listdir(tmp_path)) == 2
+    cache.clear()
+    assert os.listdir(tmp_path) == ["notes.txt"]
+    assert foreign.read_text() == "keep me"
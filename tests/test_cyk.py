@@ -0,0 +1,60 @@
+import itertools
+import sys
+
+from lfa.cnf.cnf_variant13 import to_cnf
+from lfa.cnf.cyk import CYK
+
+
+def test_recognize_batch_with_many_rules_per_parent():
+    # 256 rules S → N_i C all match "ab": a uint8 count wraps to exactly 0
+    lines = [f"S -> N{i} C" for i in range(256)]
+    lines += [f"N{i} -> a" for i in range(256)] + ["C -> b"]
+    cyk = CYK(to_cnf(lines, start="S"), start="S")
+    assert cyk.recognize("ab")
+    assert cyk.recognize_batch(["ab", "ba", "aa"]) == [True, False, False]
+
+
+def test_recognize_batch_matches_recognize():
+    cyk = CYK(to_cnf(["S->aB", "S->DA", "A->a", "A->BD", "A->bDAB",
+                      "B->b", "B->BA", "D->ε", "D->BA", "C->BA"], start="S"))
+    words = ["ab", "ba", "bb", "aa"]
+    assert cyk.recognize_batch(words) == [cyk.recognize(w) for w in words]
+
+
+def check_tree(cnf, tree, start, word):
+    """`tree` derives `word` from `start` using only rules of `cnf`."""
+    stack, leaves = [(start, tree)], []
+    while stack:
+        symbol, node = stack.pop()
+        assert node[0] == symbol
+        if len(node) == 2 and isinstance(node[1], str):
+            assert (node[1],) in cnf[symbol]
+            leaves.append(node[1])
+        else:
+            assert (node[1][0], node[2][0]) in cnf[symbol]
+            stack += [(node[2][0], node[2]), (node[1][0], node[1])]
+    assert "".join(leaves) == word
+
+
+def test_parse_agrees_with_recognize():
+    cnf = to_cnf(["S->aB", "S->DA", "A->a", "A->BD", "A->bDAB",
+                  "B->b", "B->BA", "D->ε", "D->BA", "C->BA"], start="S")
+    cyk = CYK(cnf, start="S")
+    for n in range(1, 7):
+        for word in map("".join, itertools.product("ab", repeat=n)):
+            tree = cyk.parse(word)
+            assert (tree is not None) == cyk.recognize(word), word
+            if tree is not None:
+                check_tree(cnf, tree, "S", word)
+
+
+def test_parse_deep_tree_without_recursion():
+    cnf = to_cnf(["S->aS|b"], start="S")
+    word = "a" * 299 + "b"
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(150)  # far below the depth of the tree
+    try:
+        tree = CYK(cnf, start="S").parse(word)
+    finally:
+        sys.setrecursionlimit(limit)
+    check_tree(cnf, tree, "S", word)
@@ -0,0 +1,43 @@
+import itertools
+
+from lfa.cnf.cnf_variant13 import _parse, to_cnf
+from lfa.cnf.cyk import CYK
+from lfa.cnf.earley import Earley
+
+VARIANT_13 = ["S->aB", "S->DA", "A->a", "A->BD", "A->bDAB",
+              "B->b", "B->BA", "D->ε", "D->BA", "C->BA"]
+
+
+def leaves(tree):
+    return "".join(c if isinstance(c, str) else leaves(c) for c in tree[1:])
+
+
+def test_long_right_recursion_is_recognized():
+    earley = Earley(_parse(["S->aS|b"]))
+    assert earley.recognize("a" * 5000 + "b")
+    assert not earley.recognize("a" * 5000)
+
+
+def test_agrees_with_cyk_on_variant13():
+    earley = Earley(_parse(VARIANT_13), start="S")
+    cyk = CYK(to_cnf(VARIANT_13, start="S"), start="S")
+    for n in range(7):
+        for word in map("".join, itertools.product("ab", repeat=n)):
+            assert earley.recognize(word) == cyk.recognize(word), word
+            forest = earley.parse(word)
+            assert (forest is not None) == earley.recognize(word)
+            if forest is not None:
+                assert leaves(forest.tree()) == word
+
+
+def test_forest_counts_catalan_trees():
+    forest = Earley(_parse(["S->SS|a"])).parse("a" * 10)
+    catalan_9 = 4862
+    assert forest.is_ambiguous()
+    assert forest.count() == catalan_9
+
+
+def test_cyclic_grammar_has_infinitely_many_trees():
+    forest = Earley(_parse(["S->S|a"])).parse("a")
+    assert forest.count() == float("inf")
+    assert leaves(forest.tree()) == "a"
@@ -0,0 +1,56 @@
+import time
+
+from lfa.parser.ast_nodes import BinaryOp
+from lfa.parser.expr_parser import MAX_FOLD_BITS
+from lfa.parser.parse_cache import parse_script
+
+
+def test_nested_huge_power_is_not_folded():
+    t = time.perf_counter()
+    result = parse_script("MOVE (((9^64)^64)^64)^64 forward")
+    assert time.perf_counter() - t < 1.0
+    assert not result.parse_errors
+    (cmd,) = result.commands
+    assert isinstance(cmd["args"][0], BinaryOp)
+
+
+def test_product_of_huge_powers_is_not_folded():
+    result = parse_script("MOVE (9^64)^64*(9^64)^64 forward")
+    assert not result.parse_errors
+    (cmd,) = result.commands
+    assert isinstance(cmd["args"][0], BinaryOp)
+    assert cmd["args"][1] == "forward"
+
+
+def test_small_constants_still_fold():
+    result = parse_script("MOVE 9^64 left\nMOVE 2 * (3 + 4) back")
+    assert [c["args"][0] for c in result.commands] == [str(9 ** 64), "14"]
+    assert (9 ** 64).bit_length() <= MAX_FOLD_BITS
+
+
+def test_oversized_literal_is_a_syntax_error():
+    result = parse_script("MOVE " + "9" * 5000 + " forward\nBLOCK left")
+    assert result.parse_errors == ("Line 1: Number too large (5000 digits)",)
+    assert [c["command"] for c in result.commands] == ["BLOCK"]
+
+
+def test_deep_nesting_is_a_syntax_error():
+    for prefix, suffix in (("(" * 1200, "1" + ")" * 1200), ("-" * 1200, "1")):
+        result = parse_script(f"MOVE {prefix}{suffix} left\nBLOCK left")
+        (error,) = result.parse_errors
+        assert error.startswith("Line 1: Expression nested too deeply")
+        assert [c["command"] for c in result.commands] == ["BLOCK"]
+
+
+def test_nesting_below_the_limit_parses():
+    result = parse_script("MOVE " + "(" * 150 + "x" + ")" * 150 + " left")
+    assert not result.parse_errors
+
+
+def test_complex_and_infinite_results_are_not_folded():
+    for script in ("MOVE (0-8)^(1/2) left", "MOVE (10^300/1)*(10^300/1) left"):
+        result = parse_script(script)
+        assert not result.parse_errors
+        (cmd,) = result.commands
+        assert isinstance(cmd["args"][0], BinaryOp)
+    assert parse_script("MOVE 7/2 left").commands[0]["args"][0] == "3.5"
@@ -0,0 +1,53 @@
+import gzip
+import io
+import itertools
+
+import pytest
+
+from lfa.lab4.lab4 import CombinationGenerator
+
+VARIANT_1 = "(a|b)(c|d)E+G? P(Q|R|S)T(UV|W|(X))*Z+ 1(0|1)* 2(3|4)^5 36"
+
+
+def brute_force(gen, regex_str):
+    tokens = gen.tokenize(gen._normalize_regex(regex_str), log=False)
+    options = [gen._token_options(t, tt) for t, tt in tokens]
+    return {"".join(parts) for parts in itertools.product(*options)}
+
+
+def test_count_is_exact_for_ambiguous_concatenation():
+    gen = CombinationGenerator(max_repetitions=5)
+    assert gen.count("a*a*") == 11
+    assert gen.count("(a|aa)*b?a+") == len(brute_force(gen, "(a|aa)*b?a+"))
+
+
+def test_enumerate_yields_distinct_strings_in_rank_order():
+    gen = CombinationGenerator(max_repetitions=3)
+    for regex in ("a*a*", "(a|ab)(b|bc)?c*", VARIANT_1):
+        strings = list(gen.enumerate(regex))
+        assert len(strings) == len(set(strings)) == gen.count(regex)
+        assert set(strings) == brute_force(gen, regex)
+        assert strings == sorted(strings)
+        assert strings == [gen.unrank(regex, i) for i in range(len(strings))]
+
+
+def test_compile_leaves_steps_alone():
+    gen = CombinationGenerator()
+    gen.generate_combinations("a*b", count=1, seed=1)
+    steps = list(gen.get_steps())
+    gen.count("(c|d)+")
+    gen.unrank("(c|d)+", 0)
+    assert gen.get_steps() == steps
+
+
+def test_generate_to_writes_the_same_draws():
+    gen = CombinationGenerator()
+    expected = gen.generate_combinations(VARIANT_1, count=50, seed=7)
+    out = io.BytesIO()
+    gen.generate_to(VARIANT_1, out, 50, seed=7, compression="gzip", report=False)
+    assert gzip.decompress(out.getvalue()).decode().splitlines() == expected
+
+
+def test_generate_to_rejects_text_streams_without_buffer():
+    with pytest.raises(TypeError, match="StringIO"):
+        CombinationGenerator().generate_to("a*", io.StringIO(), 3, report=False)
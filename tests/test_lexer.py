@@ -0,0 +1,71 @@
+import random
+import re
+
+import pytest
+
+from lfa.lab3 import lexer as lab3_lexer
+from lfa.lexing import LexerSpec
+from lfa.parser import lexer as parser_lexer
+
+SCRIPTS = [
+    "MOVE 10 forward", "ATTACK slash with sword", "BLOCK", "USE potion on self",
+    "CAST heal on allies", "MOVE forward 10", "FLY 4 forward", "JUMP 4 with feet",
+    "BLOCK left quickly swiftly silently", "MOVE 2 * (3 + 4) left # comment",
+    "  # only a comment\n\nMOVE 1 left $\nBLOCK", "MOVE 10forward", "CASTheal",
+]
+
+
+def reference(module, text, error):
+    """The per-line, pattern-by-pattern lexer the labs had before LexerSpec."""
+    TokenType = module.TokenType
+    tokens, errors = [], []
+    for line_number, line in enumerate(text.split('\n'), start=1):
+        line = original = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        while line:
+            for pattern, ttype in module.SPEC.patterns:
+                m = re.match(pattern, line)
+                if m:
+                    if ttype != TokenType.COMMENT:
+                        tokens.append((ttype, m.group(0)))
+                    line = line[len(m.group(0)):].lstrip()
+                    break
+            else:
+                bad = re.match(r'\S+', line).group(0)
+                errors.append(error.format(line_number=line_number, token=bad, line=original))
+                line = line[len(bad):].lstrip()
+    return tokens + [(TokenType.EOF, None)], errors
+
+
+def random_scripts(n, seed=0):
+    rnd = random.Random(seed)
+    words = ["MOVE", "BLOCK", "left", "with", "sword", "10", "x", "(", ")", "+",
+             "$", "#", "on", "self", "3abc", "__", "\t"]
+    for _ in range(n):
+        yield "\n".join(" ".join(rnd.choice(words) for _ in range(rnd.randint(0, 8)))
+                        for _ in range(rnd.randint(1, 4)))
+
+
+@pytest.mark.parametrize("module, error", [
+    (lab3_lexer, "Line {line_number}: Unexpected token '{token}' in line: '{line}'"),
+    (parser_lexer, "Line {line_number}: Unexpected token '{token}' in: {line}"),
+])
+def test_spec_matches_the_pattern_by_pattern_lexer(module, error):
+    for text in SCRIPTS + list(random_scripts(300)):
+        lexer = module.Lexer(text)
+        tokens = [(t.type, t.value) for t in lexer.tokenize()]
+        assert (tokens, lexer.errors) == reference(module, text, error), text
+
+
+def test_spec_is_shared_and_immutable():
+    assert type(lab3_lexer.SPEC) is type(parser_lexer.SPEC) is LexerSpec
+    with pytest.raises(AttributeError):
+        parser_lexer.SPEC.patterns = ()
+
+
+def test_lazy_tokens_report_lines_and_errors_as_reached():
+    errors = []
+    tokens = parser_lexer.SPEC.iter_tokens("MOVE 1 left\nBLOCK $", errors)
+    assert [(t.value, t.line) for t in tokens][:3] == [("MOVE", 1), ("1", 1), ("left", 1)]
+    assert errors == ["Line 2: Unexpected token '$' in: BLOCK $"]
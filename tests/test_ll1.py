@@ -0,0 +1,69 @@
+import pytest
+
+from lfa.parser.expr_parser import EXPR_FIRST
+from lfa.parser.grammar import COMMANDS, build_grammar
+from lfa.parser.ll1 import LL1Table
+from lfa.parser.parser import COMMAND_TABLE, Parser
+from lfa.parser.tokens import TokenType
+
+
+def test_command_grammar_expands_optional_parts():
+    g = build_grammar()
+    assert g["Script"] == [["Command", "Script"], []]
+    assert len(g["Command"]) == len(COMMANDS)
+    optionals = [A for A in g if A.startswith("Opt")]
+    assert len(optionals) == 3  # [with WEAPON], [DIRECTION], [on TARGET]
+    assert all(g[A][-1] == [] for A in optionals)
+
+
+def test_first_and_follow_sets():
+    t = COMMAND_TABLE
+    cols, nullable = t.first["Command"]
+    assert not nullable
+    assert {t.columns[c] for c in cols} == {"MOVE", "ATTACK", "BLOCK", "USE", "CAST"}
+    assert t.first["Script"][1]
+    assert t.type_col[TokenType.EOF] in t.follow["Script"]
+    # an optional part at the end of a command is followed by the next command
+    assert t.literal_col["MOVE"] in t.follow[build_grammar()["Command"][2][1]]
+
+
+def test_conflicting_grammar_is_rejected():
+    with pytest.raises(ValueError, match="not LL\\(1\\)"):
+        LL1Table(build_grammar(COMMANDS + ["MOVE NUMBER"]), "Script",
+                 externals={"Expr": EXPR_FIRST})
+
+
+def test_new_command_only_needs_a_spec_line():
+    table = LL1Table(build_grammar(COMMANDS + ["JUMP [NUMBER]"]), "Script",
+                     externals={"Expr": EXPR_FIRST})
+    parser = Parser("JUMP 3 JUMP BLOCK left")
+    commands = []
+    while parser.current.type != TokenType.EOF:
+        matched = table.run("Command", parser)
+        commands.append([tok.value for _, tok in matched])
+    assert commands == [["JUMP", "3"], ["JUMP"], ["BLOCK", "left"]]
+
+
+@pytest.mark.parametrize("script, args", [
+    ("MOVE 10 forward", ["10", "forward"]),
+    ("ATTACK slash with sword", ["slash", "sword"]),
+    ("ATTACK punch", ["punch"]),
+    ("BLOCK", []),
+    ("USE potion on self", ["potion", "self"]),
+    ("CAST shield", ["shield"]),
+    ("CAST heal on allies", ["heal", "allies"]),
+])
+def test_valid_commands(script, args):
+    (cmd,) = Parser(script).parse()
+    assert cmd == {"command": script.split()[0], "args": args}
+
+
+@pytest.mark.parametrize("script, message", [
+    ("MOVE forward 10", "Expected expression, got DIRECTION"),
+    ("ATTACK with sword", "Expected ACTION, got KEYWORD"),
+    ("USE potion self", "Expected 'on', got TARGET"),
+    ("with sword", "Unexpected KEYWORD 'with' in Command"),
+])
+def test_syntax_errors(script, message):
+    with pytest.raises(SyntaxError, match=message):
+        Parser(script).parse()
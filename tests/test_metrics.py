@@ -0,0 +1,34 @@
+import pytest
+
+import metrics
+from lfa.lab1 import main as lab1
+from lfa.lab2 import Lab2
+
+
+@pytest.fixture
+def instrumented():
+    metrics.METRICS.reset()
+    yield metrics.METRICS
+    metrics.uninstrument()
+    metrics.METRICS.reset()
+
+
+def test_dead_state_hits_include_the_last_symbol(instrumented):
+    metrics.instrument(lab1)
+    where = lab1.__name__
+    fa = lab1.Grammar().to_finite_automaton()
+    assert not fa.accepts("ax") and not fa.accepts("xa")
+    assert instrumented.get("fa_dead_state_hits_total", engine=where) == 2
+    assert not fa.accepts("a")  # ends in a live, non-final state
+    assert instrumented.get("fa_dead_state_hits_total", engine=where) == 2
+
+
+def test_get_transitions_counts_only_subset_construction(instrumented):
+    metrics.instrument(Lab2)
+    where = Lab2.__name__
+    fa = Lab2.FiniteAutomaton({"q0", "q1"}, {"a"}, {("q0", "a"): ["q0", "q1"]}, "q0", {"q1"})
+    fa.is_deterministic()
+    assert instrumented.get("fa_get_transitions_calls_total", engine=where) == 0
+    fa.to_dfa()
+    assert instrumented.get("fa_get_transitions_calls_total", engine=where) > 0
+    assert instrumented.get("fa_to_dfa_calls_total", engine=where) == 1
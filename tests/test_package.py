@@ -0,0 +1,19 @@
+import importlib
+import subprocess
+import sys
+
+import lfa
+
+
+def test_alias_module_imports_both_ways():
+    module = importlib.import_module("lfa.lab2.lab1_1")
+    from lfa.lab2 import lab1_1
+    assert module is lab1_1
+    assert module.__package__ == "lfa.lab2"
+
+
+def test_import_statement_finds_the_alias_in_a_fresh_interpreter():
+    code = "import lfa.lab2.lab1_1 as m; print(m.Grammar().classify_grammar())"
+    out = subprocess.run([sys.executable, "-c", code], cwd=lfa.ROOT,
+                         capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "Type 3 (Regular)"
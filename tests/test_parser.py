@@ -0,0 +1,48 @@
+import pytest
+
+from lfa.parser.lexer import Lexer
+from lfa.parser.parser import Parser
+
+
+def test_streamed_lexer_errors_raise():
+    with pytest.raises(SyntaxError, match=r"Line 1: Unexpected token '\$'"):
+        Parser(Lexer("MOVE 1 left $\nBLOCK")).parse()
+
+
+def test_streamed_lexer_errors_are_collected_in_recover_mode():
+    parser = Parser(Lexer("MOVE 1 left $\nBLOCK left"), recover=True)
+    assert [c["command"] for c in parser.parse()] == ["MOVE", "BLOCK"]
+    assert parser.errors == ["Line 1: Unexpected token '$' in: MOVE 1 left $"]
+
+
+def test_streaming_matches_text_source():
+    script = "MOVE 2 * (3 + 4) left\nATTACK slash with sword\nBLOCK left"
+    assert Parser(Lexer(script)).parse() == Parser(script).parse()
+
+
+@pytest.mark.parametrize("script, commands, errors", [
+    ("MOVE 1 left\nATTACK with sword\nBLOCK left",
+     ["MOVE", "BLOCK"], ["Line 2: Expected ACTION, got KEYWORD"]),
+    # cut short by the next command: reported where it started
+    ("MOVE 5\nBLOCK left", ["BLOCK"], ["Line 1: Expected DIRECTION, got COMMAND"]),
+    ("USE potion\n\nCAST heal", ["CAST"], ["Line 1: Expected 'on', got COMMAND"]),
+    ("MOVE 5", [], ["Line 1: Expected DIRECTION, got EOF"]),
+    # stray tokens are skipped up to the next line
+    ("BLOCK left left right\nCAST heal", ["BLOCK", "CAST"],
+     ["Line 1: Unexpected DIRECTION 'left' in Command"]),
+    ("with sword\nMOVE 1 left", ["MOVE"], ["Line 1: Unexpected KEYWORD 'with' in Command"]),
+    # several errors in one pass, each with its own line
+    ("MOVE x\nMOVE 1 left\nUSE potion self\nCAST heal on",
+     ["MOVE"], ["Line 1: Expected DIRECTION, got COMMAND",
+                "Line 3: Expected 'on', got TARGET",
+                "Line 4: Expected TARGET, got EOF"]),
+])
+def test_recovery_reports_every_error_with_its_line(script, commands, errors):
+    parser = Parser(script, recover=True)
+    assert [c["command"] for c in parser.parse()] == commands
+    assert parser.errors == errors
+
+
+def test_without_recover_the_first_error_raises():
+    with pytest.raises(SyntaxError, match="Expected DIRECTION, got COMMAND"):
+        Parser("MOVE x\nUSE potion self").parse()
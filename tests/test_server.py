@@ -0,0 +1,58 @@
+import asyncio
+import json
+
+from lfa.parser.server import ValidationServer
+
+
+async def request(reader, writer, rid, script):
+    writer.write(json.dumps({"id": rid, "script": script}).encode() + b"\n")
+    await writer.drain()
+    messages = []
+    while True:
+        msg = json.loads(await reader.readline())
+        messages.append(msg)
+        if msg.get("done"):
+            return messages
+
+
+def run(test, **options):
+    async def main():
+        server = ValidationServer(workers=1, **options)
+        await server.start()
+        reader, writer = await asyncio.open_connection(*server.address[:2])
+        try:
+            await test(server, reader, writer)
+        finally:
+            writer.close()
+            await server.close()
+    asyncio.run(main())
+
+
+def test_commands_are_streamed_then_a_summary():
+    async def test(server, reader, writer):
+        ok = await request(reader, writer, 1, "MOVE 10 forward\nBLOCK left")
+        assert ok == [
+            {"id": 1, "command": {"command": "MOVE", "args": ["10", "forward"]}},
+            {"id": 1, "command": {"command": "BLOCK", "args": ["left"]}},
+            {"id": 1, "done": True, "ok": True, "count": 2},
+        ]
+        bad = await request(reader, writer, 2, "MOVE 1 left\nUSE potion self")
+        assert bad[-1] == {"id": 2, "done": True, "ok": False, "count": 1, "stage": "parse",
+                           "errors": ["Line 2: Expected 'on', got TARGET"]}
+        writer.write(b"not json\n")
+        msg = json.loads(await reader.readline())
+        assert msg["stage"] == "request" and server.stats["bad_requests"] == 1
+    run(test)
+
+
+def test_timeout_replaces_the_pool_and_later_requests_succeed():
+    async def test(server, reader, writer):
+        slow = "MOVE 1 forward\n" * 300_000
+        (done,) = await request(reader, writer, 1, slow)
+        assert done["stage"] == "timeout"
+        assert server.stats["timeouts"] == 1 and server.stats["pool_restarts"] == 1
+        # the stuck worker (seconds of work left) was terminated, so the next
+        # request is not queued behind it
+        msgs = await asyncio.wait_for(request(reader, writer, 2, "BLOCK left"), 2)
+        assert msgs[-1]["ok"]
+    run(test, timeout=0.2)
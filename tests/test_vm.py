@@ -0,0 +1,24 @@
+from lfa.parser.main import run_script
+
+
+def test_run_script_reports_runtime_errors(capsys):
+    run_script("MOVE 2*speed+1 forward")
+    assert "[ERROR] Unbound variable 'speed'" in capsys.readouterr().out
+    run_script("MOVE 1/0 forward")
+    assert "[ERROR] ZeroDivisionError: division by zero" in capsys.readouterr().out
+
+
+def test_run_script_runs_constant_scripts(capsys):
+    run_script("MOVE 2 * (3 + 4) left\nBLOCK left")
+    assert "Final state: GameState(pos=(-14, 0), attacks=0, blocks=1" in capsys.readouterr().out
+
+
+def test_integer_constants_stay_exact():
+    from lfa.parser.ast_nodes import Move
+    from lfa.parser.expr_parser import MAX_FOLD_BITS
+    from lfa.parser.parse_cache import parse_script
+
+    (cmd,) = parse_script("MOVE 9^20 left").commands
+    assert Move(*cmd["args"]).amount == 9 ** 20
+    assert Move(str(2 ** MAX_FOLD_BITS - 1), "left").amount == 2 ** MAX_FOLD_BITS - 1
+    assert Move("3.5", "left").amount == 3.5